@@ -0,0 +1,119 @@
+"""
+Hot/cold archival.
+
+Closed maintenance requests and scrapped equipment that have not changed for
+a while are moved out of the hot tables into <table>_archive twins
+(migrations/0004), so listings, counts and indexes only cover active work.
+Rows move in small batches, each in its own transaction, and children move
+with their parent: a request takes its activities and worksheets, an asset
+takes its health readings. Equipment is only archived once none of its
+requests remain in the hot table.
+
+Batches lock their parents with FOR UPDATE SKIP LOCKED, so rows being
+edited right now are simply picked up by a later run. Hot-table readers that
+need history opt in to the archive explicitly (?include_archived=1).
+"""
+import time
+
+from sqlalchemy import text
+
+# parent table -> [(child table, foreign key column)], moved before the parent
+CHILDREN = {
+    'maintenance_requests': [
+        ('maintenance_request_activities', 'request_id'),
+        ('maintenance_worksheets', 'request_id'),
+    ],
+    'equipment': [
+        ('equipment_health_readings', 'equipment_id'),
+    ],
+}
+
+# Rows eligible for archival, oldest first
+CANDIDATES = {
+    'maintenance_requests': """
+        SELECT r.id FROM maintenance_requests r
+        WHERE NOT r.is_open AND r.updated_at < :cutoff
+        ORDER BY r.updated_at
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    """,
+    'equipment': """
+        SELECT e.id FROM equipment e
+        WHERE e.is_scrapped AND e.updated_at < :cutoff
+          AND NOT EXISTS (SELECT 1 FROM maintenance_requests r WHERE r.equipment_id = e.id)
+        ORDER BY e.updated_at
+        LIMIT :limit
+        FOR UPDATE OF e SKIP LOCKED
+    """,
+}
+
+_columns = {}
+
+
+def archive_columns(conn, table):
+    """Columns present in both table and its archive, in the hot table's order."""
+    if table not in _columns:
+        rows = conn.execute(text("""
+            SELECT h.column_name FROM information_schema.columns h
+            JOIN information_schema.columns a
+              ON a.table_schema = h.table_schema AND a.table_name = :archive AND a.column_name = h.column_name
+            WHERE h.table_schema = current_schema() AND h.table_name = :table
+            ORDER BY h.ordinal_position
+        """), {'table': table, 'archive': f'{table}_archive'}).scalars().all()
+        _columns[table] = ', '.join(f'"{c}"' for c in rows)
+    return _columns[table]
+
+
+def move_rows(conn, table, key, ids):
+    """Copy rows whose `key` is in ids into <table>_archive, then delete them. Returns count."""
+    columns = archive_columns(conn, table)
+    conn.execute(text(f"""
+        INSERT INTO {table}_archive ({columns})
+        SELECT {columns} FROM {table} WHERE {key} = ANY(:ids)
+    """), {'ids': ids})
+    return conn.execute(text(f"DELETE FROM {table} WHERE {key} = ANY(:ids)"), {'ids': ids}).rowcount
+
+
+def archive_batch(engine, table, cutoff, limit):
+    """Move one batch of `table` (children first). Returns {table: rows moved}, parent ids."""
+    with engine.begin() as conn:
+        ids = conn.execute(text(CANDIDATES[table]), {'cutoff': cutoff, 'limit': limit}).scalars().all()
+        if not ids:
+            return {}, []
+        moved = {child: move_rows(conn, child, key, ids) for child, key in CHILDREN[table]}
+        moved[table] = move_rows(conn, table, 'id', ids)
+    return moved, ids
+
+
+def count_candidates(engine, cutoff):
+    """Upper bound on parent rows a run will move (equipment still pinned by requests included)."""
+    with engine.connect() as conn:
+        return conn.execute(text("""
+            SELECT (SELECT count(*) FROM maintenance_requests WHERE NOT is_open AND updated_at < :cutoff)
+                 + (SELECT count(*) FROM equipment WHERE is_scrapped AND updated_at < :cutoff)
+        """), {'cutoff': cutoff}).scalar()
+
+
+def run_archival(engine, cutoff, batch_size=1000, on_batch=None):
+    """
+    Archive everything eligible as of `cutoff`. Requests go first so the
+    equipment they pinned can follow in the same run.
+
+    on_batch(table, ids, totals) is called after each committed batch; an
+    exception raised from it stops the run with earlier batches kept.
+    Returns (totals per table, elapsed ms).
+    """
+    started = time.perf_counter()
+    totals = {}
+    for table in ('maintenance_requests', 'equipment'):
+        while True:
+            moved, ids = archive_batch(engine, table, cutoff, batch_size)
+            if not ids:
+                break
+            for name, count in moved.items():
+                totals[name] = totals.get(name, 0) + count
+            if on_batch:
+                on_batch(table, ids, totals)
+            if len(ids) < batch_size:
+                break
+    return totals, round((time.perf_counter() - started) * 1000.0, 1)
@@ -0,0 +1,208 @@
+"""
+Load-balanced technician auto-assignment.
+
+Keeps one min-heap of technicians per maintenance team, keyed by the
+technician's open workload. Workload = open duration_hours plus a
+priority-weighted backlog, so a technician holding two critical jobs is
+considered busier than one holding two low-priority jobs of equal length.
+
+Heaps use lazy invalidation: whenever a technician's load changes a new
+entry is pushed and stale entries are discarded when they surface, which
+keeps assign/release at O(log n).
+
+Each process only sees the assignments it makes itself, so callers rebuild
+from the DB periodically (age()) to pick up other workers' assignments and
+team membership changes.
+"""
+import heapq
+import threading
+import time
+
+# Hours assumed for requests without an estimate
+DEFAULT_DURATION_HOURS = 1.0
+
+# Backlog weight added per open request, by priority
+PRIORITY_WEIGHTS = {
+    'low': 0.5,
+    'medium': 1.0,
+    'high': 2.0,
+    'critical': 4.0,
+}
+
+
+def parse_duration(value):
+    """Validate a request's duration_hours: None or a non-negative number of hours."""
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        raise ValueError('duration_hours must be a number')
+    try:
+        hours = float(value)
+    except (TypeError, ValueError):
+        raise ValueError('duration_hours must be a number')
+    if not 0 <= hours < 1000000:
+        raise ValueError('duration_hours must be between 0 and 1000000')
+    return hours
+
+
+def request_cost(duration_hours, priority):
+    """Load a single open request adds to its technician."""
+    hours = float(duration_hours) if duration_hours is not None else DEFAULT_DURATION_HOURS
+    return hours + PRIORITY_WEIGHTS.get(priority, PRIORITY_WEIGHTS['low'])
+
+
+class AssignmentEngine:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._heaps = {}          # team_id -> [(load, tech_id)]
+        self._members = {}        # team_id -> set(tech_id)
+        self._teams_of = {}       # tech_id -> set(team_id)
+        self._load = {}           # tech_id -> current load
+        self._requests = {}       # request_id -> (tech_id, cost)
+        self.loaded = False
+        self.built_at = None      # time.monotonic() of the last rebuild
+
+    # ---------- building ----------
+
+    def rebuild(self, memberships, open_requests):
+        """
+        Replace all state.
+
+        memberships:   iterable of (team_id, tech_id)
+        open_requests: iterable of (request_id, tech_id, duration_hours, priority)
+        """
+        with self._lock:
+            self._heaps, self._members, self._teams_of = {}, {}, {}
+            self._load, self._requests = {}, {}
+
+            for team_id, tech_id in memberships:
+                self._members.setdefault(team_id, set()).add(tech_id)
+                self._teams_of.setdefault(tech_id, set()).add(team_id)
+                self._load.setdefault(tech_id, 0.0)
+
+            for request_id, tech_id, duration_hours, priority in open_requests:
+                if tech_id is None:
+                    continue
+                cost = request_cost(duration_hours, priority)
+                self._requests[request_id] = (tech_id, cost)
+                self._load[tech_id] = self._load.get(tech_id, 0.0) + cost
+
+            for team_id, members in self._members.items():
+                heap = [(self._load[t], t) for t in members]
+                heapq.heapify(heap)
+                self._heaps[team_id] = heap
+
+            self.loaded = True
+            self.built_at = time.monotonic()
+
+    def age(self):
+        """Seconds since the last rebuild (infinite before the first)."""
+        return float('inf') if self.built_at is None else time.monotonic() - self.built_at
+
+    def add_member(self, team_id, tech_id):
+        with self._lock:
+            self._members.setdefault(team_id, set()).add(tech_id)
+            self._teams_of.setdefault(tech_id, set()).add(team_id)
+            load = self._load.setdefault(tech_id, 0.0)
+            heapq.heappush(self._heaps.setdefault(team_id, []), (load, tech_id))
+
+    def remove_member(self, team_id, tech_id):
+        with self._lock:
+            self._members.get(team_id, set()).discard(tech_id)
+            self._teams_of.get(tech_id, set()).discard(team_id)
+            # Heap entry is dropped lazily by _peek
+
+    # ---------- internals (lock held) ----------
+
+    def _set_load(self, tech_id, load):
+        self._load[tech_id] = load
+        for team_id in self._teams_of.get(tech_id, ()):
+            heap = self._heaps.setdefault(team_id, [])
+            heapq.heappush(heap, (load, tech_id))
+            # Stale entries pile up on busy teams; compact occasionally
+            if len(heap) > 4 * len(self._members[team_id]) + 16:
+                self._heaps[team_id] = heap = [(self._load[t], t) for t in self._members[team_id]]
+                heapq.heapify(heap)
+
+    def _peek(self, team_id):
+        heap = self._heaps.get(team_id)
+        members = self._members.get(team_id, ())
+        while heap:
+            load, tech_id = heap[0]
+            if tech_id in members and self._load.get(tech_id) == load:
+                return tech_id
+            heapq.heappop(heap)
+        return None
+
+    def _track(self, request_id, tech_id, cost):
+        self._untrack(request_id)
+        self._requests[request_id] = (tech_id, cost)
+        self._set_load(tech_id, self._load.get(tech_id, 0.0) + cost)
+
+    def _untrack(self, request_id):
+        entry = self._requests.pop(request_id, None)
+        if entry is None:
+            return
+        tech_id, cost = entry
+        self._set_load(tech_id, max(self._load.get(tech_id, 0.0) - cost, 0.0))
+
+    # ---------- public API ----------
+
+    def assign(self, request_id, team_id, duration_hours=None, priority='low'):
+        """Pick the least-loaded technician in the team. Returns tech_id or None."""
+        with self._lock:
+            tech_id = self._peek(team_id)
+            if tech_id is not None:
+                self._track(request_id, tech_id, request_cost(duration_hours, priority))
+            return tech_id
+
+    def track(self, request_id, tech_id, duration_hours=None, priority='low'):
+        """Record a request assigned outside the engine (manual assignment or priority change)."""
+        with self._lock:
+            if tech_id is None:
+                self._untrack(request_id)
+            else:
+                self._track(request_id, tech_id, request_cost(duration_hours, priority))
+
+    def release(self, request_id):
+        """Request closed or deleted: give its load back."""
+        with self._lock:
+            self._untrack(request_id)
+
+    def rebalance(self, team_id, requests):
+        """
+        Reassign a batch of open requests within a team.
+
+        requests: iterable of (request_id, duration_hours, priority)
+        Returns {request_id: tech_id}. Largest jobs are placed first
+        (longest-processing-time heuristic).
+        """
+        with self._lock:
+            costed = []
+            for request_id, duration_hours, priority in requests:
+                self._untrack(request_id)
+                costed.append((request_cost(duration_hours, priority), request_id))
+            costed.sort(reverse=True)
+
+            assignments = {}
+            for cost, request_id in costed:
+                tech_id = self._peek(team_id)
+                if tech_id is None:
+                    break
+                self._track(request_id, tech_id, cost)
+                assignments[request_id] = tech_id
+            return assignments
+
+    def workload(self, team_id):
+        """Current load per technician in a team, least loaded first."""
+        with self._lock:
+            members = self._members.get(team_id, ())
+            open_counts = {}
+            for tech_id, _ in self._requests.values():
+                if tech_id in members:
+                    open_counts[tech_id] = open_counts.get(tech_id, 0) + 1
+            return sorted(
+                ({'technician_id': t, 'load': round(self._load.get(t, 0.0), 2),
+                  'open_requests': open_counts.get(t, 0)} for t in members),
+                key=lambda w: (w['load'], w['technician_id'])
+            )
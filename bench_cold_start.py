@@ -0,0 +1,88 @@
+"""
+Cold-start benchmark: time from launching a worker to its first successful response.
+
+Starts a fresh backend process several times with and without warm-up and
+measures:
+  - ready:  launch -> /api/health/ready returns 200
+  - first:  launch -> first authenticated GET /api/equipment succeeds
+  - req:    latency of that first real request on its own
+
+Usage: python bench_cold_start.py [rounds]
+Needs the same database as app.py (DATABASE_URL).
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+PORT = int(os.environ.get('BENCH_PORT', '5055'))
+BASE_URL = f'http://127.0.0.1:{PORT}/api'
+EMAIL = 'admin@test.com'
+PASSWORD = '123456'
+TIMEOUT = 60
+
+SERVER = (
+    "from app import create_app; "
+    f"create_app().run(port={PORT}, debug=False, use_reloader=False, threaded=True)"
+)
+
+
+def call(method, path, body=None, token=None):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(f'{BASE_URL}{path}', data=data, method=method)
+    req.add_header('Content-Type', 'application/json')
+    if token:
+        req.add_header('Authorization', f'Bearer {token}')
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        return resp.status, json.loads(resp.read() or b'null')
+
+
+def wait_for(path, started):
+    while time.perf_counter() - started < TIMEOUT:
+        try:
+            status, _ = call('GET', path)
+            if status == 200:
+                return time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.01)
+    raise RuntimeError(f'{path} not reachable after {TIMEOUT}s')
+
+
+def run_once(prewarm):
+    env = dict(os.environ, PREWARM_ON_START='1' if prewarm else '0')
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, '-c', SERVER], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        ready = wait_for('/health/ready', started)
+        _, body = call('POST', '/login', {'email': EMAIL, 'password': PASSWORD})
+        req_started = time.perf_counter()
+        status, _ = call('GET', '/equipment', token=body['token'])
+        done = time.perf_counter()
+        if status != 200:
+            raise RuntimeError(f'GET /equipment returned {status}')
+        return ready * 1000, (done - started) * 1000, (done - req_started) * 1000
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print("🚀 Cold-start benchmark\n")
+    for prewarm in (False, True):
+        samples = [run_once(prewarm) for _ in range(rounds)]
+        label = 'prewarm on ' if prewarm else 'prewarm off'
+        for name, idx in (('ready', 0), ('first', 1), ('req', 2)):
+            values = sorted(s[idx] for s in samples)
+            print(f"{label}  {name:<6} median {values[len(values) // 2]:8.1f} ms"
+                  f"   min {values[0]:8.1f} ms   max {values[-1]:8.1f} ms")
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Near-duplicate detection for incoming corrective requests.
+
+Each open corrective request is reduced to a MinHash signature over the
+character shingles of its subject + description. The signature uses
+one-permutation hashing: every shingle is hashed once, the hash picks one of
+NUM_PERM bins and each bin keeps its minimum; empty bins borrow from the next
+filled bin (rotation densification). That keeps a signature to one hash per
+shingle instead of NUM_PERM.
+
+Signatures are split into LSH bands and bucketed per equipment_id, so a new
+report is only compared with requests on the same asset that share at least
+one band; the estimated Jaccard similarity is the fraction of matching
+signature slots.
+
+With 16 bands of 4 rows, pairs at 0.6 similarity collide in at least one
+band ~89% of the time, pairs at 0.3 only ~12%. The index lives in memory,
+is rebuilt from the DB on first use and kept current as this process creates
+and closes requests; callers rebuild it periodically (age()) to pick up
+requests other workers created.
+"""
+import re
+import threading
+import time
+
+SHINGLE_SIZE = 4
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+# Added per bin of distance when an empty bin borrows a neighbour's minimum
+_ROTATION = 1 << 58
+_MASK = (1 << 64) - 1
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+
+def shingles(subject, description=None):
+    """Character shingles of the normalized text (lowercase words, single spaces)."""
+    text = ' '.join(_WORD.findall(f'{subject or ""} {description or ""}'.lower()))
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def signature(shingle_set):
+    if not shingle_set:
+        return None
+    bins = [None] * NUM_PERM
+    for shingle in shingle_set:
+        # Process-local string hash: signatures never leave this process's index
+        h = hash(shingle) & _MASK
+        slot, value = h % NUM_PERM, h // NUM_PERM
+        if bins[slot] is None or value < bins[slot]:
+            bins[slot] = value
+    # Empty bins take the next filled bin to the right (wrapping), offset by the distance
+    sig = list(bins)
+    donor = None
+    for i in range(2 * NUM_PERM - 1, -1, -1):
+        slot = i % NUM_PERM
+        if bins[slot] is not None:
+            donor = slot
+        elif i < NUM_PERM:
+            sig[slot] = bins[donor] + ((donor - slot) % NUM_PERM) * _ROTATION
+    return tuple(sig)
+
+
+def similarity(sig_a, sig_b):
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def band_keys(sig):
+    return [(band, hash(sig[band * ROWS:(band + 1) * ROWS])) for band in range(BANDS)]
+
+
+class DuplicateIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}        # equipment_id -> {(band, key): set(request_id)}
+        self._entries = {}        # request_id -> (equipment_id, signature)
+        self.loaded = False
+        self.built_at = None      # time.monotonic() of the last rebuild
+        self.stats = {'lookups': 0, 'matches': 0, 'last_lookup_us': None}
+
+    def rebuild(self, open_requests):
+        """open_requests: iterable of (request_id, equipment_id, subject, description)."""
+        entries = {}
+        for request_id, equipment_id, subject, description in open_requests:
+            sig = signature(shingles(subject, description))
+            if equipment_id is not None and sig is not None:
+                entries[request_id] = (equipment_id, sig)
+        with self._lock:
+            self._buckets, self._entries = {}, {}
+            for request_id, (equipment_id, sig) in entries.items():
+                self._insert(request_id, equipment_id, sig)
+            self.loaded = True
+            self.built_at = time.monotonic()
+
+    def age(self):
+        """Seconds since the last rebuild (infinite before the first)."""
+        return float('inf') if self.built_at is None else time.monotonic() - self.built_at
+
+    def _insert(self, request_id, equipment_id, sig):
+        buckets = self._buckets.setdefault(equipment_id, {})
+        for key in band_keys(sig):
+            buckets.setdefault(key, set()).add(request_id)
+        self._entries[request_id] = (equipment_id, sig)
+
+    def _delete(self, request_id):
+        entry = self._entries.pop(request_id, None)
+        if entry is None:
+            return
+        equipment_id, sig = entry
+        buckets = self._buckets.get(equipment_id, {})
+        for key in band_keys(sig):
+            members = buckets.get(key)
+            if members is not None:
+                members.discard(request_id)
+                if not members:
+                    del buckets[key]
+        if not buckets:
+            self._buckets.pop(equipment_id, None)
+
+    def add(self, request_id, equipment_id, subject, description):
+        """Index an open request (replaces any earlier entry for it)."""
+        sig = signature(shingles(subject, description))
+        with self._lock:
+            self._delete(request_id)
+            if equipment_id is not None and sig is not None:
+                self._insert(request_id, equipment_id, sig)
+
+    def remove(self, request_id):
+        """Request closed or gone."""
+        with self._lock:
+            self._delete(request_id)
+
+    def find(self, equipment_id, subject, description, threshold, limit=5):
+        """[(request_id, similarity)] on the same asset at or above threshold, best first."""
+        started = time.perf_counter()
+        sig = signature(shingles(subject, description))
+        matches = []
+        with self._lock:
+            buckets = self._buckets.get(equipment_id)
+            if sig is not None and buckets:
+                candidates = set()
+                for key in band_keys(sig):
+                    candidates |= buckets.get(key, set())
+                for request_id in candidates:
+                    score = similarity(sig, self._entries[request_id][1])
+                    if score >= threshold:
+                        matches.append((request_id, score))
+            self.stats['lookups'] += 1
+            self.stats['matches'] += 1 if matches else 0
+            self.stats['last_lookup_us'] = round((time.perf_counter() - started) * 1e6, 1)
+        matches.sort(key=lambda m: (-m[1], m[0]))
+        return matches[:limit]
+
+    def snapshot(self):
+        with self._lock:
+            return {**self.stats, 'indexed_requests': len(self._entries), 'assets': len(self._buckets)}
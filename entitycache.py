@@ -0,0 +1,249 @@
+"""
+Serialized-entity cache.
+
+Each entity's JSON payload is stored under (table, id) together with the row
+version it was built from (updated_at, maintained by trigger). A payload that
+embeds other rows (a request carries its equipment, stage and technician
+names) is versioned by the tuple of all their updated_at values. A lookup only hits
+when the caller's version matches, so a row changed by any writer in any
+process, bulk SQL included, simply misses and is re-serialized. Write
+handlers also evict the rows they change to free the space early.
+
+Listings fetch (id, version) pairs, pull the matching fragments with one
+get_many and serialize only the misses; the response is the fragments joined
+as bytes, never decoded again.
+
+Backends:
+  LRUBackend   in-process, bounded by entry count and payload bytes
+  KVBackend    any store with get/mget/set/delete (redis-py compatible);
+               LocalKVStore is an in-memory stand-in for it
+"""
+import collections
+import json
+import threading
+import time
+
+# Rough per-entry bookkeeping cost (key tuple, version string, dict slot)
+ENTRY_OVERHEAD = 200
+# Misses are rebuilt in chunks so one cold listing never binds an unbounded IN list
+BUILD_CHUNK_SIZE = 2000
+
+
+def encode(payload):
+    return json.dumps(payload, separators=(',', ':'), default=str).encode()
+
+
+def extend(fragment, **fields):
+    """Append live fields to a cached JSON object without decoding it."""
+    if not fields:
+        return fragment
+    return fragment[:-1] + b',' + encode(fields)[1:]
+
+
+def json_array(fragments):
+    return b'[' + b','.join(fragments) + b']'
+
+
+def version_tag(version):
+    if isinstance(version, tuple):
+        # Composite version: every part must match, so no part can hide a change in another
+        return '|'.join('' if part is None else version_tag(part) for part in version)
+    return version.isoformat() if hasattr(version, 'isoformat') else str(version)
+
+
+class LRUBackend:
+    def __init__(self, max_entries=50000, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()   # (table, id) -> (version, payload)
+        self._bytes = 0
+        self.evictions = 0
+
+    def get_many(self, keys):
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = entry
+        return found
+
+    def set(self, key, version, payload):
+        size = len(payload) + ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[1]) + ENTRY_OVERHEAD
+            self._entries[key] = (version, payload)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted) + ENTRY_OVERHEAD
+                self.evictions += 1
+
+    def delete(self, keys):
+        with self._lock:
+            for key in keys:
+                old = self._entries.pop(key, None)
+                if old is not None:
+                    self._bytes -= len(old[1]) + ENTRY_OVERHEAD
+
+    def stats(self):
+        with self._lock:
+            return {'backend': 'lru', 'entries': len(self._entries), 'bytes': self._bytes,
+                    'max_entries': self.max_entries, 'max_bytes': self.max_bytes,
+                    'evictions': self.evictions}
+
+
+class KVBackend:
+    """Entries live in an external store as b'<version>\\n<payload>' with a TTL."""
+
+    def __init__(self, client, prefix='gearguard:entity:', ttl=3600):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def _key(self, key):
+        table, entity_id = key
+        return f'{self.prefix}{table}:{entity_id}'
+
+    def get_many(self, keys):
+        keys = list(keys)
+        if not keys:
+            return {}
+        found = {}
+        for key, value in zip(keys, self.client.mget([self._key(k) for k in keys])):
+            if value is not None:
+                version, _, payload = value.partition(b'\n')
+                found[key] = (version.decode(), payload)
+        return found
+
+    def set(self, key, version, payload):
+        self.client.set(self._key(key), version.encode() + b'\n' + payload, ex=self.ttl)
+
+    def delete(self, keys):
+        keys = [self._key(k) for k in keys]
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self):
+        return {'backend': type(self.client).__name__, 'prefix': self.prefix, 'ttl': self.ttl}
+
+
+class LocalKVStore:
+    """In-memory stand-in for the redis-py calls KVBackend makes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}   # key -> (value, expires_at)
+
+    def _live(self, key, now):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        if item[1] is not None and item[1] <= now:
+            del self._data[key]
+            return None
+        return item[0]
+
+    def get(self, key):
+        with self._lock:
+            return self._live(key, time.monotonic())
+
+    def mget(self, keys):
+        now = time.monotonic()
+        with self._lock:
+            return [self._live(key, now) for key in keys]
+
+    def set(self, key, value, ex=None):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(1 for key in keys if self._data.pop(key, None) is not None)
+
+
+class EntityCache:
+    def __init__(self):
+        self.backend = None
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def init_app(self, app):
+        kind = app.config['ENTITY_CACHE_BACKEND']
+        if kind == 'lru':
+            self.backend = LRUBackend(app.config['ENTITY_CACHE_MAX_ENTRIES'], app.config['ENTITY_CACHE_MAX_BYTES'])
+        elif kind == 'local':
+            self.backend = KVBackend(LocalKVStore(), ttl=app.config['ENTITY_CACHE_TTL'])
+        elif kind == 'redis':
+            import redis  # optional dependency, only needed for a shared cache
+            self.backend = KVBackend(redis.Redis.from_url(app.config['ENTITY_CACHE_URL']),
+                                     ttl=app.config['ENTITY_CACHE_TTL'])
+        elif kind == 'off':
+            self.backend = None
+        else:
+            raise ValueError(f'Unknown ENTITY_CACHE_BACKEND: {kind}')
+
+    def _count(self, hits, misses):
+        with self._lock:
+            self._stats['hits'] += hits
+            self._stats['misses'] += misses
+
+    def fetch(self, table, entity_id, version, build):
+        """
+        Cached payload bytes for one row, or None if build() finds nothing.
+        build() -> (version, payload dict) read from the row itself.
+        """
+        def build_one(ids):
+            built = build()
+            return {entity_id: built} if built is not None else {}
+        return self.fetch_many(table, [(entity_id, version)], build_one).get(entity_id)
+
+    def fetch_many(self, table, pairs, build_many):
+        """
+        {id: payload bytes} for [(id, version)]. build_many(ids) returns
+        {id: (version, payload dict)} for the misses; rows it does not return
+        (deleted meanwhile) are left out.
+        """
+        pairs = [(entity_id, version_tag(version)) for entity_id, version in pairs]
+        found = self.backend.get_many((table, entity_id) for entity_id, _ in pairs) if self.backend else {}
+
+        result, missing = {}, []
+        for entity_id, version in pairs:
+            entry = found.get((table, entity_id))
+            if entry is not None and entry[0] == version:
+                result[entity_id] = entry[1]
+            else:
+                missing.append(entity_id)
+        self._count(len(result), len(missing))
+
+        for start in range(0, len(missing), BUILD_CHUNK_SIZE):
+            built = build_many(missing[start:start + BUILD_CHUNK_SIZE])
+            for entity_id, (version, payload) in built.items():
+                data = encode(payload)
+                result[entity_id] = data
+                if self.backend:
+                    # Tagged with the version the payload was read at, which may be newer than the pair's
+                    self.backend.set((table, entity_id), version_tag(version), data)
+        return result
+
+    def invalidate(self, table, ids):
+        ids = list(ids)
+        if self.backend and ids:
+            self.backend.delete((table, entity_id) for entity_id in ids)
+        with self._lock:
+            self._stats['invalidations'] += len(ids)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        looked_up = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / looked_up, 4) if looked_up else None
+        stats.update(self.backend.stats() if self.backend else {'backend': 'off'})
+        return stats
@@ -0,0 +1,227 @@
+"""
+High-throughput sensor ingest for equipment health.
+
+Readings are buffered in memory and flushed in micro-batches by a background
+thread. Within a batch only the newest reading per asset is kept, so each
+flush is one UPDATE ... FROM (VALUES ...) per chunk of assets no matter how
+many readings arrived. Assets whose health falls below the alert threshold
+during a flush get a corrective MaintenanceRequest, unless one is already
+open; its idempotency key is the asset's health incident number
+(auto-health:<equipment_id>:<n>), so a crossing seen twice creates one request.
+"""
+import atexit
+import datetime
+import math
+import threading
+import time
+
+from sqlalchemy import text
+
+# Assets per UPDATE statement (3 bind params each, well under Postgres' 65535)
+FLUSH_CHUNK_SIZE = 5000
+
+
+def _values_clause(rows, prefix):
+    params = {}
+    tuples = []
+    for i, row in enumerate(rows):
+        names = [f'{prefix}{j}_{i}' for j in range(len(row))]
+        params.update(zip(names, row))
+        tuples.append('(' + ', '.join(f':{n}' for n in names) + ')')
+    return ', '.join(tuples), params
+
+
+def flush_health_batch(session, batch, threshold):
+    """
+    Apply one coalesced batch: [(equipment_id, health, recorded_at)].
+
+    Returns the list of auto-created requests as
+    (request_id, technician_user_id, duration_hours, priority).
+    """
+    created = []
+    for start in range(0, len(batch), FLUSH_CHUNK_SIZE):
+        chunk = batch[start:start + FLUSH_CHUNK_SIZE]
+        values_sql, params = _values_clause(chunk, 'r')
+
+        # old is read (and locked) before the update, so crossings are detected
+        # exactly once even when several workers flush the same asset
+        crossings = session.execute(text(f"""
+            WITH v(id, health, ts) AS (VALUES {values_sql}),
+            old AS (
+                SELECT e.id, e.health_percentage AS old_health
+                FROM equipment e JOIN v ON v.id = e.id
+                ORDER BY e.id
+                FOR UPDATE OF e
+            ),
+            history AS (
+                INSERT INTO equipment_health_readings (equipment_id, health_percentage, recorded_at)
+                SELECT v.id, v.health, v.ts FROM v JOIN old ON old.id = v.id
+            )
+            UPDATE equipment AS e
+            SET health_percentage = v.health,
+                version = e.version + 1    -- a client's If-Match from before the reading now gets 409
+            FROM v JOIN old ON old.id = v.id
+            WHERE e.id = v.id
+              AND e.health_percentage IS DISTINCT FROM v.health
+            RETURNING e.id, e.name, e.company_id, old.old_health, v.health, v.ts
+        """), params).all()
+
+        alerts = [
+            (eq_id, name, company_id, old_health, health, ts)
+            for eq_id, name, company_id, old_health, health, ts in crossings
+            if health < threshold and (old_health is None or old_health >= threshold)
+        ]
+        if alerts:
+            created.extend(_create_alert_requests(session, alerts))
+
+    session.commit()
+    return created
+
+
+def _create_alert_requests(session, alerts):
+    rows = []
+    for eq_id, name, company_id, old_health, health, ts in alerts:
+        rows.append((
+            eq_id,
+            company_id,
+            f'Health critical: {name}'[:255],
+            f'Sensor reported {health}% health at {ts.isoformat()} (was {old_health}%).',
+            'critical' if health < 10 else 'high',
+        ))
+    values_sql, params = _values_clause(rows, 'a')
+
+    # Skip assets that already have an open auto-created request. Otherwise this is
+    # the asset's next incident, numbered across live and archived requests; the
+    # equipment row is locked by the caller, so concurrent flushes agree on n.
+    result = session.execute(text(f"""
+        INSERT INTO maintenance_requests
+            (idempotency_key, equipment_id, company_id, subject, description, request_type, priority)
+        SELECT 'auto-health:' || v.equipment_id || ':' || (
+                   SELECT COALESCE(MAX(substring(k.idempotency_key FROM '^auto-health:[0-9]+:([0-9]+)$')::int), 0) + 1
+                   FROM (
+                       SELECT idempotency_key FROM maintenance_requests WHERE equipment_id = v.equipment_id
+                       UNION ALL
+                       SELECT idempotency_key FROM maintenance_requests_archive WHERE equipment_id = v.equipment_id
+                   ) k
+               ),
+               v.equipment_id, v.company_id, v.subject, v.description,
+               'corrective', v.priority::priority_level
+        FROM (VALUES {values_sql}) AS v(equipment_id, company_id, subject, description, priority)
+        WHERE NOT EXISTS (
+            SELECT 1 FROM maintenance_requests r
+            WHERE r.equipment_id = v.equipment_id
+              AND r.idempotency_key LIKE 'auto-health:%'
+              AND r.is_open
+        )
+        ON CONFLICT (idempotency_key) DO NOTHING
+        RETURNING id, technician_user_id, duration_hours, priority
+    """), params)
+    return [tuple(row) for row in result]
+
+
+class HealthIngestBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}        # equipment_id -> (health, recorded_at)
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._flush_fn = None
+        self.interval = 0.5
+        self.max_pending = 5000
+        self.stats = {'received': 0, 'coalesced': 0, 'flushed_assets': 0,
+                      'flushes': 0, 'alerts': 0, 'errors': 0, 'last_flush_ms': None}
+
+    def init_app(self, app, flush_fn):
+        """flush_fn(batch) runs inside an app context and returns the alerts it created."""
+        self.interval = app.config['INGEST_FLUSH_INTERVAL']
+        self.max_pending = app.config['INGEST_MAX_PENDING']
+        self._flush_fn = flush_fn
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, args=(app,), name='gearguard-ingest', daemon=True)
+            self._thread.start()
+            atexit.register(self._flush_on_exit, app)
+
+    def add(self, readings):
+        """readings: iterable of (equipment_id, health, recorded_at). Returns count accepted."""
+        count = coalesced = 0
+        with self._lock:
+            pending = self._pending
+            for eq_id, health, ts in readings:
+                current = pending.get(eq_id)
+                if current is None:
+                    pending[eq_id] = (health, ts)
+                else:
+                    coalesced += 1
+                    if ts >= current[1]:
+                        pending[eq_id] = (health, ts)
+                count += 1
+            self.stats['received'] += count
+            self.stats['coalesced'] += coalesced
+            full = len(pending) >= self.max_pending
+        if full:
+            self._wakeup.set()
+        return count
+
+    def _take(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return [(eq_id, health, ts) for eq_id, (health, ts) in pending.items()]
+
+    def flush(self):
+        batch = self._take()
+        if not batch:
+            return 0
+        started = time.perf_counter()
+        try:
+            created = self._flush_fn(batch)
+        except Exception:
+            # Put the batch back (unless newer readings arrived meanwhile) and retry next tick
+            with self._lock:
+                self.stats['errors'] += 1
+                for eq_id, health, ts in batch:
+                    current = self._pending.get(eq_id)
+                    if current is None or ts > current[1]:
+                        self._pending[eq_id] = (health, ts)
+            raise
+        with self._lock:
+            self.stats['flushes'] += 1
+            self.stats['flushed_assets'] += len(batch)
+            self.stats['alerts'] += len(created)
+            self.stats['last_flush_ms'] = round((time.perf_counter() - started) * 1000.0, 1)
+        return len(batch)
+
+    def _run(self, app):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                with app.app_context():
+                    self.flush()
+            except Exception:
+                app.logger.exception('Health ingest flush failed')
+
+    def _flush_on_exit(self, app):
+        try:
+            with app.app_context():
+                self.flush()
+        except Exception:
+            app.logger.exception('Final health ingest flush failed')
+
+    def snapshot(self):
+        with self._lock:
+            return {**self.stats, 'pending_assets': len(self._pending)}
+
+
+def parse_reading(item, now=None):
+    """Validate one {'equipment_id', 'health', 'ts'?} reading -> (id, health, ts)."""
+    eq_id = int(item['equipment_id'])
+    health = float(item['health'])
+    if not math.isfinite(health):
+        # Flask's JSON parser accepts NaN and Infinity
+        raise ValueError(f'health must be a finite number, got {item["health"]!r}')
+    health = int(round(health))
+    ts = item.get('ts')
+    ts = datetime.datetime.fromisoformat(ts) if ts else (now or datetime.datetime.utcnow())
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return eq_id, min(max(health, 0), 100), ts
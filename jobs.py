@@ -0,0 +1,135 @@
+"""
+Background job runner for heavy reports and exports.
+
+Jobs are persisted by the caller (see the background_jobs table in app.py);
+this module only knows how to run them. Each job runs on a worker thread
+inside an app context, reports progress through a JobContext and writes its
+result to a file named after the hash of its parameters, so identical
+requests can be served from disk.
+"""
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def params_hash(kind, params):
+    """Stable hash of a job kind + its normalized parameters."""
+    payload = json.dumps({'kind': kind, 'params': params or {}}, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class JobContext:
+    def __init__(self, runner, job_id, params):
+        self._runner = runner
+        self.job_id = job_id
+        self.params = params or {}
+
+    @property
+    def cancelled(self):
+        return self._runner.is_cancelled(self.job_id)
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise JobCancelled()
+
+    def progress(self, fraction, message=None):
+        """Report progress (0..1); also the point where cancellation takes effect."""
+        self.check_cancelled()
+        self._runner.store.update(self.job_id, progress=round(min(max(fraction, 0.0), 1.0), 4), message=message)
+
+
+class JobRunner:
+    """
+    store must provide:
+      claim(job_id) -> bool                 queued -> running, False if someone else has it
+      update(job_id, **fields)              persist progress/message
+      finish(job_id, status, result_path=None, error=None)
+      cancel_requested(job_id) -> bool
+    """
+
+    def __init__(self):
+        self.result_dir = None
+        self.handlers = {}
+        self.store = None
+        self._app = None
+        self._executor = None
+        self._cancelled = set()
+        self._lock = threading.Lock()
+
+    def init_app(self, app, store):
+        self._app = app
+        self.store = store
+        self.result_dir = app.config['JOB_RESULT_DIR']
+        os.makedirs(self.result_dir, exist_ok=True)
+
+    def register(self, kind, extension='json', normalize=None):
+        """
+        Decorator: fn(ctx) -> result. JSON results are dumped for you; other
+        extensions must write ctx.result_path themselves. normalize(params)
+        fills in defaults so equivalent requests hash the same.
+        """
+        def decorator(fn):
+            self.handlers[kind] = (fn, extension, normalize or (lambda params: params or {}))
+            return fn
+        return decorator
+
+    def normalize(self, kind, params):
+        return self.handlers[kind][2](params)
+
+    def result_path(self, kind, digest):
+        return os.path.join(self.result_dir, f'{kind}-{digest}.{self.handlers[kind][1]}')
+
+    def submit(self, job_id, kind, params, digest):
+        # Worker threads start with the first job, so processes that never run one have none
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._app.config['JOB_WORKERS'],
+                                                    thread_name_prefix='gearguard-job')
+        self._executor.submit(self._run, job_id, kind, params, digest)
+
+    def cancel(self, job_id):
+        with self._lock:
+            self._cancelled.add(job_id)
+
+    def is_cancelled(self, job_id):
+        with self._lock:
+            if job_id in self._cancelled:
+                return True
+        # Cancellation may have been requested through another worker process
+        if self.store.cancel_requested(job_id):
+            self.cancel(job_id)
+            return True
+        return False
+
+    def _run(self, job_id, kind, params, digest):
+        with self._app.app_context():
+            if not self.store.claim(job_id):
+                return
+            fn, extension, _ = self.handlers[kind]
+            path = self.result_path(kind, digest)
+            ctx = JobContext(self, job_id, params)
+            ctx.result_path = f'{path}.{job_id}.tmp'
+            try:
+                ctx.check_cancelled()
+                result = fn(ctx)
+                if extension == 'json':
+                    with open(ctx.result_path, 'w') as f:
+                        json.dump(result, f, default=str)
+                os.replace(ctx.result_path, path)
+                self.store.finish(job_id, 'succeeded', result_path=path)
+            except JobCancelled:
+                self.store.finish(job_id, 'cancelled')
+            except Exception as e:
+                self._app.logger.exception('Job %s (%s) failed', job_id, kind)
+                self.store.finish(job_id, 'failed', error=str(e))
+            finally:
+                if os.path.exists(ctx.result_path):
+                    os.remove(ctx.result_path)
+                with self._lock:
+                    self._cancelled.discard(job_id)
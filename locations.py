@@ -0,0 +1,123 @@
+"""
+Hierarchical equipment locations.
+
+A location is up to four levels, site / building / floor / room, stored on
+the asset as a materialized path: the segments joined by '/', with a
+trailing '/' so 'Plant A/' never matches 'Plant AB/'. A subtree is then one
+prefix range on the text_pattern_ops index over equipment.location_path
+(migrations/0006, 0007) instead of a LIKE scan over free-form strings.
+
+build_tree() rolls per-path aggregates up into nested nodes, so a plant-floor
+view reads one subtree with one grouped query.
+"""
+LEVELS = ('site', 'building', 'floor', 'room')
+SEPARATOR = '/'
+
+
+def to_segments(value):
+    """
+    Segments from {'site': ..., 'building': ..., ...} or a 'Site / Building'
+    string. Levels must be filled from the top without gaps.
+    """
+    if value is None:
+        return []
+    if isinstance(value, dict):
+        unknown = set(value) - set(LEVELS)
+        if unknown:
+            raise ValueError(f"Unknown location level(s): {', '.join(sorted(unknown))}")
+        segments = [str(value[level]).strip() if value.get(level) not in (None, '') else '' for level in LEVELS]
+        while segments and not segments[-1]:
+            segments.pop()
+        if '' in segments:
+            raise ValueError('Location levels must be filled from site down, without gaps')
+        # A separator inside a level would silently add levels to the stored path
+        if any(SEPARATOR in segment for segment in segments):
+            raise ValueError(f"Location levels cannot contain '{SEPARATOR}'")
+    elif isinstance(value, str):
+        segments = [s.strip() for s in value.strip().strip(SEPARATOR).split(SEPARATOR)] if value.strip() else []
+        if '' in segments:
+            raise ValueError('Location path has an empty segment')
+    else:
+        raise ValueError('Location must be a string or an object')
+    if len(segments) > len(LEVELS) or len(from_path(to_path(segments))) != len(segments):
+        raise ValueError(f'Location has more than {len(LEVELS)} levels')
+    return segments
+
+
+def to_path(segments):
+    return SEPARATOR.join(segments) + SEPARATOR if segments else None
+
+
+def from_path(path):
+    return path.rstrip(SEPARATOR).split(SEPARATOR) if path else []
+
+
+def display(segments):
+    """Human-readable form kept in the legacy equipment.location column."""
+    return ' / '.join(segments) if segments else None
+
+
+def subtree_pattern(path):
+    """LIKE pattern for every path at or below `path` (a stored path, trailing '/')."""
+    escaped = path.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return escaped + '%'
+
+
+def _node(name, segments):
+    return {
+        'name': name,
+        'path': SEPARATOR.join(segments),
+        'level': LEVELS[len(segments) - 1] if segments else None,
+        'equipment_count': 0,
+        'critical_count': 0,
+        'open_requests': 0,
+        'min_health': None,
+        '_health_sum': 0,
+        '_health_count': 0,
+        '_children': {},
+    }
+
+
+def _add(node, count, health_sum, health_count, min_health, critical, open_requests):
+    node['equipment_count'] += count
+    node['critical_count'] += critical
+    node['open_requests'] += int(open_requests or 0)
+    node['_health_sum'] += int(health_sum or 0)
+    node['_health_count'] += health_count
+    if min_health is not None and (node['min_health'] is None or min_health < node['min_health']):
+        node['min_health'] = min_health
+
+
+def _finish(node):
+    node['avg_health'] = round(node.pop('_health_sum') / node['_health_count'], 1) if node['_health_count'] else None
+    del node['_health_count']
+    children = node.pop('_children')
+    node['children'] = [_finish(child) for _, child in sorted(children.items())]
+    return node
+
+
+def build_tree(rows, root=(), depth=None):
+    """
+    Nested aggregates under `root` (segments). rows are per stored path:
+    (location_path, count, health_sum, health_count, min_health, critical, open_requests).
+    Assets without a location count towards the root only, as 'unlocated'.
+    Below `depth` levels, deeper paths are folded into their ancestor; so are
+    paths deeper than LEVELS, which only rows stored before validation can have.
+    """
+    root = list(root)
+    limit = len(LEVELS) - len(root)
+    depth = limit if depth is None else min(depth, limit)
+    tree = _node(root[-1] if root else None, root)
+    tree['unlocated'] = 0
+    for path, *stats in rows:
+        _add(tree, *stats)
+        if path is None:
+            tree['unlocated'] += stats[0]
+            continue
+        node, segments = tree, list(root)
+        below = from_path(path)[len(root):]
+        for segment in below[:depth]:
+            segments.append(segment)
+            node = node['_children'].setdefault(segment, _node(segment, segments))
+            _add(node, *stats)
+    return _finish(tree)
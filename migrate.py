@@ -0,0 +1,248 @@
+"""
+Versioned schema migrations.
+
+queries.sql creates the baseline schema; everything after it lives in
+migrations/NNNN_name.sql and is applied in order, once, with each applied
+version recorded in schema_migrations. A migration whose first line is
+'-- migrate: no-transaction' runs statement by statement in autocommit mode
+(needed for CREATE INDEX CONCURRENTLY); all others run in one transaction.
+
+check_schema() compares the ORM models against the live database.
+"""
+import hashlib
+import os
+import re
+
+from sqlalchemy import inspect
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+NO_TRANSACTION_MARKER = '-- migrate: no-transaction'
+
+# Serializes migrators across workers/hosts
+ADVISORY_LOCK_ID = 7301_2025
+
+
+class MigrationError(Exception):
+    pass
+
+
+class Migration:
+    def __init__(self, path):
+        filename = os.path.basename(path)
+        match = re.match(r'^(\d+)_(\w+)\.sql$', filename)
+        if not match:
+            raise MigrationError(f'Bad migration file name: {filename}')
+        self.version = int(match.group(1))
+        self.name = match.group(2)
+        with open(path) as f:
+            self.sql = f.read()
+        self.checksum = hashlib.sha256(self.sql.encode()).hexdigest()
+        self.transactional = not self.sql.lstrip().startswith(NO_TRANSACTION_MARKER)
+
+    def statements(self):
+        return split_statements(self.sql)
+
+
+def discover(directory=MIGRATIONS_DIR):
+    migrations = sorted(
+        (Migration(os.path.join(directory, f)) for f in os.listdir(directory) if f.endswith('.sql')),
+        key=lambda m: m.version
+    )
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise MigrationError('Duplicate migration version numbers')
+    return migrations
+
+
+def split_statements(sql):
+    """Split a script on top-level semicolons (quotes, $$ bodies and comments respected)."""
+    statements, buf = [], []
+    i, n = 0, len(sql)
+    while i < n:
+        ch = sql[i]
+        if sql.startswith('--', i):
+            end = sql.find('\n', i)
+            end = n if end == -1 else end
+            buf.append(sql[i:end])
+            i = end
+        elif ch == "'":
+            end = i + 1
+            while end < n:
+                if sql[end] == "'" and sql[end + 1:end + 2] == "'":
+                    end += 2
+                elif sql[end] == "'":
+                    break
+                else:
+                    end += 1
+            buf.append(sql[i:end + 1])
+            i = end + 1
+        elif ch == '$':
+            tag = re.match(r'\$\w*\$', sql[i:])
+            if tag:
+                end = sql.find(tag.group(0), i + len(tag.group(0)))
+                end = n if end == -1 else end + len(tag.group(0))
+                buf.append(sql[i:end])
+                i = end
+            else:
+                buf.append(ch)
+                i += 1
+        elif ch == ';':
+            statements.append(''.join(buf))
+            buf = []
+            i += 1
+        else:
+            buf.append(ch)
+            i += 1
+    statements.append(''.join(buf))
+
+    def has_code(stmt):
+        return any(line.strip() and not line.strip().startswith('--') for line in stmt.splitlines())
+    return [s.strip() for s in statements if has_code(s)]
+
+
+def _ensure_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            checksum VARCHAR(64) NOT NULL,
+            applied_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+        )
+    """)
+
+
+def _applied(cursor):
+    cursor.execute("SELECT version, checksum FROM schema_migrations")
+    return dict(cursor.fetchall())
+
+
+def _drop_invalid_indexes(cursor, migration):
+    # A failed CONCURRENTLY build leaves an INVALID index that IF NOT EXISTS would skip
+    names = re.findall(r'CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+IF\s+NOT\s+EXISTS\s+(\w+)',
+                       migration.sql, re.IGNORECASE)
+    for name in names:
+        cursor.execute("""
+            SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = %s AND NOT i.indisvalid
+        """, (name,))
+        if cursor.fetchone():
+            cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+def status(engine, directory=MIGRATIONS_DIR):
+    """[(migration, state)] where state is 'applied', 'pending' or 'changed'."""
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        _ensure_table(cursor)
+        raw.commit()
+        applied = _applied(cursor)
+    finally:
+        raw.close()
+    result = []
+    for m in discover(directory):
+        if m.version not in applied:
+            result.append((m, 'pending'))
+        elif applied[m.version] != m.checksum:
+            result.append((m, 'changed'))
+        else:
+            result.append((m, 'applied'))
+    return result
+
+
+def migrate(engine, target=None, directory=MIGRATIONS_DIR, log=print):
+    """Apply pending migrations up to `target` (inclusive). Returns versions applied."""
+    migrations = discover(directory)
+    raw = engine.raw_connection()
+    dbapi = raw.dbapi_connection  # autocommit must be set on the driver connection
+    done = []
+    try:
+        dbapi.autocommit = True
+        cursor = dbapi.cursor()
+        cursor.execute("SELECT to_regclass('public.maintenance_requests')")
+        if cursor.fetchone()[0] is None:
+            raise MigrationError('Baseline schema missing: load queries.sql first')
+
+        cursor.execute("SELECT pg_advisory_lock(%s)", (ADVISORY_LOCK_ID,))
+        try:
+            _ensure_table(cursor)
+            applied = _applied(cursor)
+            for m in migrations:
+                if m.version in applied or (target is not None and m.version > target):
+                    continue
+                log(f'Applying {m.version:04d}_{m.name}' + ('' if m.transactional else ' (no transaction)'))
+                if m.transactional:
+                    dbapi.autocommit = False
+                    try:
+                        for stmt in m.statements():
+                            cursor.execute(stmt)
+                        cursor.execute(
+                            "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                            (m.version, m.name, m.checksum))
+                        dbapi.commit()
+                    except Exception:
+                        dbapi.rollback()
+                        raise
+                    finally:
+                        dbapi.autocommit = True
+                else:
+                    _drop_invalid_indexes(cursor, m)
+                    for stmt in m.statements():
+                        cursor.execute(stmt)
+                    cursor.execute(
+                        "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                        (m.version, m.name, m.checksum))
+                done.append(m.version)
+        finally:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", (ADVISORY_LOCK_ID,))
+    finally:
+        dbapi.autocommit = False  # the connection goes back to the pool
+        raw.close()
+    return done
+
+
+def _affinity(sa_type):
+    return getattr(sa_type, '_type_affinity', type(sa_type))
+
+
+def check_schema(engine, metadata):
+    """
+    Compare ORM tables against the live schema.
+
+    Returns (errors, warnings). Errors break the app (missing tables/columns,
+    incompatible types, missing indexes the ORM declares); warnings are
+    drift worth knowing about (nullability, NOT NULL columns the ORM never sets).
+    """
+    errors, warnings = [], []
+    inspector = inspect(engine)
+    live_tables = set(inspector.get_table_names())
+
+    for table in metadata.sorted_tables:
+        if table.name not in live_tables:
+            errors.append(f'{table.name}: table missing')
+            continue
+
+        live_columns = {c['name']: c for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            live = live_columns.get(column.name)
+            if live is None:
+                errors.append(f'{table.name}.{column.name}: column missing')
+                continue
+            if not issubclass(_affinity(live['type']), _affinity(column.type)) and \
+                    not issubclass(_affinity(column.type), _affinity(live['type'])):
+                errors.append(f'{table.name}.{column.name}: model type {column.type} '
+                              f'but database has {live["type"]}')
+            if not column.primary_key and column.nullable is False and live['nullable']:
+                warnings.append(f'{table.name}.{column.name}: NOT NULL in model, nullable in database')
+
+        for name, live in live_columns.items():
+            if name not in table.columns and not live['nullable'] and live.get('default') is None:
+                warnings.append(f'{table.name}.{name}: NOT NULL without default but not mapped by the model')
+
+        live_indexes = {ix['name'] for ix in inspector.get_indexes(table.name)}
+        live_indexes |= {uc['name'] for uc in inspector.get_unique_constraints(table.name)}
+        for index in table.indexes:
+            if index.name not in live_indexes:
+                errors.append(f'{table.name}: index {index.name} missing (run db-migrate)')
+
+    return errors, warnings
@@ -0,0 +1,46 @@
+-- Tables and columns for risk scoring, background jobs and sensor ingest.
+-- Written with IF NOT EXISTS so databases that already have them are untouched.
+
+-- Failure-risk scoring: health history + per-asset score written by the batch job
+CREATE TABLE IF NOT EXISTS equipment_health_readings (
+    id BIGSERIAL PRIMARY KEY,
+    equipment_id INTEGER REFERENCES equipment(id) ON DELETE CASCADE NOT NULL,
+    health_percentage INTEGER NOT NULL,
+    recorded_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS ix_health_readings_equipment_time ON equipment_health_readings(equipment_id, recorded_at);
+
+-- Seed one reading per asset so scoring has a starting point
+INSERT INTO equipment_health_readings (equipment_id, health_percentage)
+SELECT e.id, e.health_percentage FROM equipment e
+WHERE e.health_percentage IS NOT NULL
+  AND NOT EXISTS (SELECT 1 FROM equipment_health_readings r WHERE r.equipment_id = e.id);
+
+ALTER TABLE equipment
+ADD COLUMN IF NOT EXISTS risk_score DOUBLE PRECISION,
+ADD COLUMN IF NOT EXISTS risk_scored_at TIMESTAMP WITH TIME ZONE;
+
+-- Background jobs for heavy reports/exports (results cached on disk by params_hash)
+CREATE TABLE IF NOT EXISTS background_jobs (
+    id SERIAL PRIMARY KEY,
+    kind VARCHAR(50) NOT NULL,
+    params JSONB DEFAULT '{}'::jsonb,
+    params_hash VARCHAR(64) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued', -- queued/running/succeeded/failed/cancelled
+    progress DOUBLE PRECISION DEFAULT 0,
+    message VARCHAR(255),
+    result_path VARCHAR(500),
+    error TEXT,
+    cancel_requested BOOLEAN DEFAULT FALSE,
+    created_by INTEGER REFERENCES users(id),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS ix_background_jobs_params_hash ON background_jobs(params_hash);
+
+-- Sensor ingest: auto-created corrective requests are deduplicated by this key
+ALTER TABLE maintenance_requests
+ADD COLUMN IF NOT EXISTS idempotency_key VARCHAR(100);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_maintenance_requests_idempotency_key ON maintenance_requests(idempotency_key);
@@ -0,0 +1,38 @@
+-- Denormalize "open" (stage is not closed) onto maintenance_requests so open
+-- work can be served from partial indexes instead of joining every stage.
+
+ALTER TABLE maintenance_requests
+ADD COLUMN IF NOT EXISTS is_open BOOLEAN NOT NULL DEFAULT TRUE;
+
+UPDATE maintenance_requests r
+SET is_open = NOT COALESCE(s.is_closed, FALSE)
+FROM maintenance_stages s
+WHERE s.id = r.stage_id
+  AND r.is_open IS DISTINCT FROM NOT COALESCE(s.is_closed, FALSE);
+
+-- Runs after trg_maintenance_defaults (triggers fire in name order), so the default stage is already set
+CREATE OR REPLACE FUNCTION maintenance_requests_open_flag() RETURNS TRIGGER AS $$
+BEGIN
+  NEW.is_open := NOT COALESCE((SELECT is_closed FROM maintenance_stages WHERE id = NEW.stage_id), FALSE);
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_requests_open_flag ON maintenance_requests;
+CREATE TRIGGER trg_requests_open_flag
+BEFORE INSERT OR UPDATE OF stage_id ON maintenance_requests
+FOR EACH ROW EXECUTE FUNCTION maintenance_requests_open_flag();
+
+-- Re-flag requests when a stage itself is opened/closed
+CREATE OR REPLACE FUNCTION maintenance_stages_sync_open_flag() RETURNS TRIGGER AS $$
+BEGIN
+  UPDATE maintenance_requests SET is_open = NOT COALESCE(NEW.is_closed, FALSE)
+  WHERE stage_id = NEW.id AND is_open IS DISTINCT FROM NOT COALESCE(NEW.is_closed, FALSE);
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_stages_sync_open_flag ON maintenance_stages;
+CREATE TRIGGER trg_stages_sync_open_flag
+AFTER UPDATE OF is_closed ON maintenance_stages
+FOR EACH ROW EXECUTE FUNCTION maintenance_stages_sync_open_flag();
@@ -0,0 +1,16 @@
+-- migrate: no-transaction
+-- Indexes for the Kanban board, dashboard and equipment listing. Built
+-- CONCURRENTLY so writes keep flowing while they are created.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_maintenance_requests_stage_id ON maintenance_requests(stage_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_maintenance_requests_equipment_id ON maintenance_requests(equipment_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_maintenance_requests_technician_user_id ON maintenance_requests(technician_user_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_maintenance_requests_scheduled_date ON maintenance_requests(scheduled_date);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_equipment_health_percentage ON equipment(health_percentage);
+
+-- Open work only: overdue/open counts, per-equipment active counts
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_maintenance_requests_open_scheduled ON maintenance_requests(scheduled_date) WHERE is_open;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_maintenance_requests_open_equipment ON maintenance_requests(equipment_id) WHERE is_open;
+
+-- Critical equipment (dashboard "health < 30")
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_equipment_critical ON equipment(health_percentage) WHERE health_percentage < 30;
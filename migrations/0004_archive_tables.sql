@@ -0,0 +1,39 @@
+-- Cold storage for finished work (see archive.py). Each archive table mirrors
+-- its hot table's columns (LIKE copies types and NOT NULLs, not foreign keys,
+-- so archived rows can outlive what they referenced) plus archived_at.
+-- Columns added to a hot table later should be added to its archive too;
+-- archival only copies the columns both tables share.
+
+CREATE TABLE IF NOT EXISTS maintenance_requests_archive (
+    LIKE maintenance_requests,
+    archived_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    PRIMARY KEY (id)
+);
+CREATE INDEX IF NOT EXISTS ix_maintenance_requests_archive_equipment_id ON maintenance_requests_archive(equipment_id);
+
+CREATE TABLE IF NOT EXISTS maintenance_request_activities_archive (
+    LIKE maintenance_request_activities,
+    archived_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    PRIMARY KEY (id)
+);
+CREATE INDEX IF NOT EXISTS ix_maintenance_request_activities_archive_request_id ON maintenance_request_activities_archive(request_id);
+
+CREATE TABLE IF NOT EXISTS maintenance_worksheets_archive (
+    LIKE maintenance_worksheets,
+    archived_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    PRIMARY KEY (id)
+);
+
+CREATE TABLE IF NOT EXISTS equipment_archive (
+    LIKE equipment,
+    archived_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    PRIMARY KEY (id)
+);
+
+CREATE TABLE IF NOT EXISTS equipment_health_readings_archive (
+    LIKE equipment_health_readings,
+    archived_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    PRIMARY KEY (id)
+);
+CREATE INDEX IF NOT EXISTS ix_equipment_health_readings_archive_equipment_time
+    ON equipment_health_readings_archive(equipment_id, recorded_at);
@@ -0,0 +1,7 @@
+-- migrate: no-transaction
+-- Let archival find its candidates without scanning the hot tables.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_maintenance_requests_closed_updated
+    ON maintenance_requests(updated_at) WHERE NOT is_open;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_equipment_scrapped_updated
+    ON equipment(updated_at) WHERE is_scrapped;
@@ -0,0 +1,20 @@
+-- Structured equipment locations as materialized paths (see locations.py):
+-- 'Site/Building/Floor/Room/'. Existing free-form locations are split on '/'
+-- and kept when they fit the four levels; the rest stay unlocated until edited.
+
+ALTER TABLE equipment ADD COLUMN IF NOT EXISTS location_path VARCHAR(1024);
+ALTER TABLE equipment_archive ADD COLUMN IF NOT EXISTS location_path VARCHAR(1024);
+
+UPDATE equipment e
+SET location_path = p.path
+FROM (
+    SELECT id, array_to_string(parts, '/') || '/' AS path, parts
+    FROM (
+        SELECT id, regexp_split_to_array(trim(both '/ ' from location), '\s*/\s*') AS parts
+        FROM equipment
+        WHERE location_path IS NULL AND trim(coalesce(location, '')) <> ''
+    ) s
+) p
+WHERE e.id = p.id
+  AND cardinality(p.parts) <= 4
+  AND NOT ('' = ANY(p.parts));
@@ -0,0 +1,6 @@
+-- migrate: no-transaction
+-- Prefix index for subtree lookups (location_path LIKE 'Site/Building/%').
+-- text_pattern_ops so LIKE prefixes use it regardless of the database collation.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_equipment_location_path
+    ON equipment(location_path text_pattern_ops);
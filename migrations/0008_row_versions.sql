@@ -0,0 +1,8 @@
+-- Optimistic concurrency: edits through the API update
+-- "WHERE id = ? AND version = ?" and bump the version (ORM version_id_col).
+-- Archives carry the column so archived rows keep their last version.
+
+ALTER TABLE maintenance_requests ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE equipment ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE maintenance_requests_archive ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE equipment_archive ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
@@ -0,0 +1,7 @@
+-- Reports that match an open request on the same asset (dedup.py) are either
+-- merged into it or inserted with a link back to it.
+-- No foreign key: the original may be archived (moved) while the linked copy
+-- is still open, and the link should keep pointing at it.
+
+ALTER TABLE maintenance_requests ADD COLUMN IF NOT EXISTS duplicate_of INTEGER;
+ALTER TABLE maintenance_requests_archive ADD COLUMN IF NOT EXISTS duplicate_of INTEGER;
@@ -0,0 +1,12 @@
+-- Cached request payloads embed the stage and technician names, so their
+-- cache version includes these rows' updated_at as well (see app.py
+-- request_version_rows); like equipment, they get a trigger-maintained column.
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT now();
+ALTER TABLE maintenance_stages ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT now();
+
+DROP TRIGGER IF EXISTS trg_users_updated ON users;
+CREATE TRIGGER trg_users_updated BEFORE UPDATE ON users FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+DROP TRIGGER IF EXISTS trg_stages_updated ON maintenance_stages;
+CREATE TRIGGER trg_stages_updated BEFORE UPDATE ON maintenance_stages FOR EACH ROW EXECUTE FUNCTION set_updated_at();
@@ -1,6 +1,18 @@
 -- =============================================
 -- 0. CLEANUP (Wipe everything for a clean slate)
 -- =============================================
+-- Migration bookkeeping and migration-created tables too, so db-migrate
+-- re-applies everything on top of the fresh schema below
+DROP TABLE IF EXISTS schema_migrations CASCADE;
+DROP TABLE IF EXISTS equipment_health_readings_archive CASCADE;
+DROP TABLE IF EXISTS maintenance_worksheets_archive CASCADE;
+DROP TABLE IF EXISTS maintenance_request_activities_archive CASCADE;
+DROP TABLE IF EXISTS maintenance_requests_archive CASCADE;
+DROP TABLE IF EXISTS equipment_archive CASCADE;
+DROP TABLE IF EXISTS background_jobs CASCADE;
+DROP TABLE IF EXISTS maintenance_worksheets CASCADE;
+DROP TABLE IF EXISTS departments CASCADE;
+DROP TABLE IF EXISTS equipment_health_readings CASCADE;
 DROP TABLE IF EXISTS maintenance_parts CASCADE;
 DROP TABLE IF EXISTS preventive_schedules CASCADE;
 DROP TABLE IF EXISTS maintenance_attachments CASCADE;
@@ -299,4 +311,13 @@ CREATE TABLE maintenance_worksheets (
 
 -- 1. Add the missing column
 ALTER TABLE departments 
-ADD COLUMN company_id INTEGER REFERENCES companies(id);
\ No newline at end of file
+ADD COLUMN company_id INTEGER REFERENCES companies(id);
+
+-- Technician auto-assignment picks from team members
+INSERT INTO maintenance_team_members_rel (team_id, user_id) VALUES (1, 2);
+
+-- =============================================
+-- 5. MIGRATIONS
+-- =============================================
+-- Everything after this baseline lives in migrations/ and is applied with:
+--   flask --app app db-migrate
@@ -0,0 +1,190 @@
+"""
+Token-bucket rate limiting.
+
+Every API call spends one token from two buckets of its route class (auth,
+reads, writes, exports, ingest): one for the caller and one for the caller's tenant,
+so a single runaway script is stopped by its own bucket well before it can
+use up its company's share. A bucket holds up to `burst` tokens and refills
+at `rate` tokens per second. A call is allowed only if both buckets have a
+token; otherwise neither is charged and the caller gets the seconds until
+one is back (Retry-After).
+
+Limits are written "rate,burst" (tokens per second, bucket size); 'off'
+or an unset limit disables that bucket.
+
+Backends:
+  LocalBuckets  in-process dict; each worker counts on its own, so N workers
+                allow up to N times the configured rate
+  RedisBuckets  one Lua script per check, shared by every worker (redis-py)
+"""
+import math
+import threading
+import time
+
+ROUTE_CLASSES = ('auth', 'reads', 'writes', 'exports', 'ingest')
+SCOPES = ('user', 'tenant')
+
+
+def parse_limit(value):
+    """'10,50' -> (10.0, 50.0); 'off' or empty -> None."""
+    if value is None or str(value).strip().lower() in ('', 'off', '0'):
+        return None
+    rate, _, burst = str(value).partition(',')
+    rate = float(rate)
+    burst = float(burst) if burst.strip() else max(1.0, rate)
+    if rate <= 0 or burst < 1:
+        raise ValueError(f'Bad rate limit {value!r}: rate must be > 0 and burst >= 1')
+    return rate, burst
+
+
+class LocalBuckets:
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = {}   # key -> (tokens, last refill, time it is full again) on time.monotonic()
+
+    def take(self, checks):
+        """
+        checks: [(key, rate, burst)]. Spends one token from every bucket if
+        each has one. Returns 0 when allowed, else seconds until it would be.
+        """
+        now = time.monotonic()
+        with self._lock:
+            levels, wait = [], 0.0
+            for key, rate, burst in checks:
+                bucket = self._buckets.get(key)
+                tokens = burst if bucket is None else min(burst, bucket[0] + (now - bucket[1]) * rate)
+                levels.append(tokens)
+                if tokens < 1:
+                    wait = max(wait, (1 - tokens) / rate)
+            if wait:
+                return wait
+            for (key, rate, burst), tokens in zip(checks, levels):
+                self._buckets[key] = (tokens - 1, now, now + (burst - tokens + 1) / rate)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+        return 0
+
+    def _prune(self, now):
+        # A bucket that has refilled carries no state. Trim to 90% so pruning stays rare.
+        self._buckets = {key: bucket for key, bucket in self._buckets.items() if bucket[2] > now}
+        keep = int(self.max_keys * 0.9)
+        if len(self._buckets) > keep:
+            # Still too many live callers: forget the ones closest to full
+            ordered = sorted(self._buckets.items(), key=lambda item: item[1][2])
+            self._buckets = dict(ordered[len(ordered) - keep:])
+
+    def stats(self):
+        with self._lock:
+            return {'backend': 'local', 'buckets': len(self._buckets), 'max_keys': self.max_keys}
+
+
+# KEYS: bucket keys. ARGV: now, then rate and burst for each key.
+# All-or-nothing like LocalBuckets.take; returns the wait as a string (Lua numbers
+# come back truncated to integers otherwise).
+TAKE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local levels, wait = {}, 0
+for i, key in ipairs(KEYS) do
+    local rate, burst = tonumber(ARGV[2 * i]), tonumber(ARGV[2 * i + 1])
+    local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = burst
+    if bucket[1] then
+        tokens = math.min(burst, tonumber(bucket[1]) + math.max(0, now - tonumber(bucket[2])) * rate)
+    end
+    levels[i] = tokens
+    if tokens < 1 then wait = math.max(wait, (1 - tokens) / rate) end
+end
+if wait > 0 then return tostring(wait) end
+for i, key in ipairs(KEYS) do
+    local rate, burst = tonumber(ARGV[2 * i]), tonumber(ARGV[2 * i + 1])
+    redis.call('HMSET', key, 'tokens', levels[i] - 1, 'ts', now)
+    redis.call('EXPIRE', key, math.ceil(burst / rate) + 1)
+end
+return '0'
+"""
+
+
+class RedisBuckets:
+    """Buckets as hashes {tokens, ts} that expire once they would be full again."""
+
+    def __init__(self, client, prefix='gearguard:ratelimit:'):
+        self.client = client
+        self.prefix = prefix
+        self._take = client.register_script(TAKE_SCRIPT)
+
+    def take(self, checks):
+        args = [time.time()]
+        for _, rate, burst in checks:
+            args += [rate, burst]
+        return float(self._take(keys=[self.prefix + key for key, _, _ in checks], args=args))
+
+    def stats(self):
+        return {'backend': type(self.client).__name__, 'prefix': self.prefix}
+
+
+class RateLimiter:
+    def __init__(self):
+        self.backend = None
+        self.limits = {}     # route class -> {scope: (rate, burst) or None}
+        self._lock = threading.Lock()
+        self._stats = {'allowed': 0, 'limited': 0, 'backend_errors': 0}
+        self._limited_by_class = {}
+
+    def init_app(self, app):
+        kind = app.config['RATE_LIMIT_BACKEND']
+        if kind == 'local':
+            self.backend = LocalBuckets(app.config['RATE_LIMIT_MAX_KEYS'])
+        elif kind == 'redis':
+            import redis  # optional dependency, only needed for limits shared across workers
+            self.backend = RedisBuckets(redis.Redis.from_url(app.config['RATE_LIMIT_URL']))
+        elif kind == 'off':
+            self.backend = None
+        else:
+            raise ValueError(f'Unknown RATE_LIMIT_BACKEND: {kind}')
+        self.limits = {
+            route_class: {scope: parse_limit(app.config.get(f'RATE_LIMIT_{route_class.upper()}_{scope.upper()}'))
+                          for scope in SCOPES}
+            for route_class in ROUTE_CLASSES
+        }
+
+    def check(self, route_class, user_key, tenant_key):
+        """Seconds to wait before retrying, or 0 if the call may proceed."""
+        if self.backend is None:
+            return 0
+        limits = self.limits[route_class]
+        checks = [(f'{route_class}:{scope}:{key}', *limits[scope])
+                  for scope, key in (('user', user_key), ('tenant', tenant_key))
+                  if key is not None and limits[scope] is not None]
+        if not checks:
+            return 0
+        try:
+            wait = self.backend.take(checks)
+        except Exception:
+            # A shared store that is down must not take the API down with it
+            with self._lock:
+                self._stats['backend_errors'] += 1
+            return 0
+        with self._lock:
+            if wait:
+                self._stats['limited'] += 1
+                self._limited_by_class[route_class] = self._limited_by_class.get(route_class, 0) + 1
+            else:
+                self._stats['allowed'] += 1
+        return wait
+
+    def stats(self):
+        with self._lock:
+            stats = {**self._stats, 'limited_by_class': dict(self._limited_by_class)}
+        stats['limits'] = {
+            route_class: {scope: ({'rate': limit[0], 'burst': limit[1]} if limit else None)
+                          for scope, limit in scopes.items()}
+            for route_class, scopes in self.limits.items()
+        }
+        stats.update(self.backend.stats() if self.backend else {'backend': 'off'})
+        return stats
+
+
+def retry_after_header(wait):
+    """Retry-After takes whole seconds; round up so a retry at that time succeeds."""
+    return str(max(1, math.ceil(wait)))
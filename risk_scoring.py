@@ -0,0 +1,180 @@
+"""
+Fleet-wide failure-risk scoring.
+
+Loads health readings and request history for every active asset in a few
+bulk queries, scores them with vectorized NumPy and writes all scores back
+in a single UPDATE. Request history spans the hot table and
+maintenance_requests_archive, where archive.py moves closed requests.
+"""
+import datetime
+import time
+
+import numpy as np
+from sqlalchemy import text
+
+# Look-back windows (days)
+READING_WINDOW_DAYS = 90
+CORRECTIVE_WINDOW_DAYS = 180
+PREVENTIVE_HORIZON_DAYS = 365
+
+# Component scales: the value at which a component reaches ~63% of its range
+DEGRADATION_SCALE = 0.5      # health points lost per day
+CORRECTIVE_SCALE = 1.0       # corrective requests per 30 days
+PREVENTIVE_GAP_SCALE = 180   # days since last completed preventive
+
+# Component weights (sum to 1)
+WEIGHT_HEALTH = 0.35
+WEIGHT_DEGRADATION = 0.25
+WEIGHT_CORRECTIVE = 0.25
+WEIGHT_PREVENTIVE = 0.15
+
+SECONDS_PER_DAY = 86400.0
+
+# Closed requests live in either table depending on whether archival has run
+REQUEST_HISTORY = """(
+    SELECT equipment_id, request_type, stage_id, created_at, scheduled_date FROM maintenance_requests
+    UNION ALL
+    SELECT equipment_id, request_type, stage_id, created_at, scheduled_date FROM maintenance_requests_archive
+)"""
+
+
+def _group_index(ids, keys):
+    """Map each key to its row in the sorted `ids` array; -1 if unknown."""
+    idx = np.searchsorted(ids, keys)
+    idx = np.minimum(idx, len(ids) - 1)
+    return np.where(ids[idx] == keys, idx, -1)
+
+
+def degradation_slopes(n, idx, days, health):
+    """Least-squares slope of health over time (points/day) per asset."""
+    count = np.bincount(idx, minlength=n).astype(np.float64)
+    sx = np.bincount(idx, weights=days, minlength=n)
+    sy = np.bincount(idx, weights=health, minlength=n)
+    sxx = np.bincount(idx, weights=days * days, minlength=n)
+    sxy = np.bincount(idx, weights=days * health, minlength=n)
+
+    denom = count * sxx - sx * sx
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (count * sxy - sx * sy) / denom
+    # Fewer than two distinct timestamps -> no trend
+    return np.where((count >= 2) & (denom > 1e-9), slope, 0.0)
+
+
+def compute_risk_scores(equipment_ids, health,
+                        reading_ids, reading_days, reading_health,
+                        corrective_ids, corrective_days,
+                        preventive_ids, preventive_days):
+    """
+    Score every asset from 0 (no risk) to 100 (imminent failure).
+
+    All `*_days` arrays are ages in days relative to "now" (0 = now,
+    positive = in the past). `equipment_ids` must be sorted ascending.
+    """
+    equipment_ids = np.asarray(equipment_ids, dtype=np.int64)
+    n = len(equipment_ids)
+    if n == 0:
+        return np.empty(0, dtype=np.float64)
+
+    health = np.clip(np.asarray(health, dtype=np.float64), 0, 100)
+
+    # 1. Degradation slope over the reading window (time runs forward, so x = -age)
+    r_idx = _group_index(equipment_ids, np.asarray(reading_ids, dtype=np.int64))
+    keep = r_idx >= 0
+    slope = degradation_slopes(
+        n, r_idx[keep],
+        -np.asarray(reading_days, dtype=np.float64)[keep],
+        np.asarray(reading_health, dtype=np.float64)[keep],
+    )
+    degradation = np.clip(-slope, 0, None)
+
+    # 2. Corrective request frequency (per 30 days) over the corrective window
+    c_idx = _group_index(equipment_ids, np.asarray(corrective_ids, dtype=np.int64))
+    c_days = np.asarray(corrective_days, dtype=np.float64)
+    c_idx = c_idx[(c_idx >= 0) & (c_days <= CORRECTIVE_WINDOW_DAYS)]
+    corrective_freq = np.bincount(c_idx, minlength=n) * (30.0 / CORRECTIVE_WINDOW_DAYS)
+
+    # 3. Days since last completed preventive (capped at the horizon)
+    p_idx = _group_index(equipment_ids, np.asarray(preventive_ids, dtype=np.int64))
+    p_days = np.asarray(preventive_days, dtype=np.float64)
+    keep = p_idx >= 0
+    since_preventive = np.full(n, float(PREVENTIVE_HORIZON_DAYS))
+    np.minimum.at(since_preventive, p_idx[keep], np.clip(p_days[keep], 0, None))
+
+    score = (
+        WEIGHT_HEALTH * (100.0 - health) / 100.0
+        + WEIGHT_DEGRADATION * (1.0 - np.exp(-degradation / DEGRADATION_SCALE))
+        + WEIGHT_CORRECTIVE * (1.0 - np.exp(-corrective_freq / CORRECTIVE_SCALE))
+        + WEIGHT_PREVENTIVE * np.minimum(since_preventive / PREVENTIVE_GAP_SCALE, 1.0)
+    )
+    return np.round(np.clip(score * 100.0, 0, 100), 2)
+
+
+def _columns(result, dtypes):
+    """Turn a result set into one NumPy array per column."""
+    rows = result.all()
+    if not rows:
+        return [np.empty(0, dtype=dt) for dt in dtypes]
+    cols = list(zip(*rows))
+    return [np.asarray(col, dtype=dt) for col, dt in zip(cols, dtypes)]
+
+
+def score_fleet(session, now=None):
+    """Run the scoring job against the database. Returns (count, elapsed_ms)."""
+    started = time.perf_counter()
+    now = now or datetime.datetime.utcnow()
+    params = {'now': now}
+
+    equipment_ids, health = _columns(session.execute(text("""
+        SELECT id, COALESCE(health_percentage, 100)::float8
+        FROM equipment
+        WHERE NOT COALESCE(is_scrapped, FALSE)
+        ORDER BY id
+    """)), (np.int64, np.float64))
+
+    reading_ids, reading_days, reading_health = _columns(session.execute(text("""
+        SELECT equipment_id,
+               EXTRACT(EPOCH FROM (:now - recorded_at))::float8 / 86400.0,
+               health_percentage::float8
+        FROM equipment_health_readings
+        WHERE recorded_at >= :now - make_interval(days => :window)
+    """), {**params, 'window': READING_WINDOW_DAYS}), (np.int64, np.float64, np.float64))
+
+    corrective_ids, corrective_days = _columns(session.execute(text(f"""
+        SELECT equipment_id,
+               EXTRACT(EPOCH FROM (:now - created_at))::float8 / 86400.0
+        FROM {REQUEST_HISTORY} r
+        WHERE request_type = 'corrective'
+          AND equipment_id IS NOT NULL
+          AND created_at >= :now - make_interval(days => :window)
+    """), {**params, 'window': CORRECTIVE_WINDOW_DAYS}), (np.int64, np.float64))
+
+    preventive_ids, preventive_days = _columns(session.execute(text(f"""
+        SELECT r.equipment_id,
+               MIN(EXTRACT(EPOCH FROM (:now - COALESCE(r.scheduled_date, r.created_at)))::float8) / 86400.0
+        FROM {REQUEST_HISTORY} r
+        JOIN maintenance_stages s ON s.id = r.stage_id
+        WHERE r.request_type = 'preventive'
+          AND r.equipment_id IS NOT NULL
+          AND s.is_closed AND NOT s.is_scrap
+        GROUP BY r.equipment_id
+    """), params), (np.int64, np.float64))
+
+    scores = compute_risk_scores(
+        equipment_ids, health,
+        reading_ids, reading_days, reading_health,
+        corrective_ids, corrective_days,
+        preventive_ids, preventive_days,
+    )
+
+    if len(equipment_ids):
+        session.execute(text("""
+            UPDATE equipment AS e
+            SET risk_score = v.score, risk_scored_at = :now,
+                version = e.version + 1
+            FROM unnest(CAST(:ids AS integer[]), CAST(:scores AS double precision[])) AS v(id, score)
+            WHERE e.id = v.id
+        """), {'ids': equipment_ids.tolist(), 'scores': scores.tolist(), 'now': now})
+    session.commit()
+
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+    return len(equipment_ids), round(elapsed_ms, 1)
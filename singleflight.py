@@ -0,0 +1,75 @@
+"""
+Single-flight request coalescing.
+
+Concurrent callers asking for the same key share one in-flight
+computation: the first caller (the leader) runs it, everyone who arrives
+while it is running waits and receives the same result (or exception).
+Nothing is cached once the leader finishes.
+"""
+import threading
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = {}
+
+    def _count(self, label, field):
+        # Lock held by caller
+        stats = self._stats.setdefault(label, {'executed': 0, 'coalesced': 0, 'timeouts': 0})
+        stats[field] += 1
+
+    def do(self, key, fn, timeout=None, label='default'):
+        """
+        Run fn() once per key across concurrent callers and return its result.
+
+        Followers wait up to `timeout` seconds; if the leader has not finished
+        by then they give up waiting and run fn() themselves.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                    self._count(label, 'executed')
+                call.event.set()
+            return call.result
+
+        if not call.event.wait(timeout):
+            with self._lock:
+                self._count(label, 'timeouts')
+                self._count(label, 'executed')
+            return fn()
+
+        with self._lock:
+            self._count(label, 'coalesced')
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self):
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'routes': {label: dict(s) for label, s in self._stats.items()},
+            }
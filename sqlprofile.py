@@ -0,0 +1,175 @@
+"""
+Opt-in per-request SQL profiler.
+
+Hooks SQLAlchemy cursor events to record every statement a request runs:
+its parameter shape (types only, never values), duration and row count.
+Statements slower than SQL_SLOW_MS are logged together with their EXPLAIN
+plan, and statements repeated SQL_REPEAT_THRESHOLD+ times in one request are
+flagged as likely N+1 loops. Finished profiles are kept in a small ring
+buffer for the debug endpoint and summarized in response headers.
+
+SQL_PROFILING: 'off' (default), 'header' (only requests sending
+X-Profile-SQL: 1) or 'always'.
+"""
+import collections
+import itertools
+import logging
+import threading
+import time
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Profile-SQL'
+
+
+def params_shape(parameters, executemany):
+    """Describe bound parameters without leaking their values."""
+    def shape(params):
+        if isinstance(params, dict):
+            return {k: type(v).__name__ for k, v in params.items()}
+        if isinstance(params, (list, tuple)):
+            return [type(v).__name__ for v in params]
+        return type(params).__name__
+    if executemany:
+        return {'executemany': len(parameters), 'row': shape(parameters[0]) if parameters else None}
+    return shape(parameters)
+
+
+class SQLProfiler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._recent = collections.deque(maxlen=100)
+        self._engine = None
+        self.config = {}
+
+    def init_app(self, app, engine):
+        self.config = app.config
+        self._engine = engine
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+        app.before_request(self._start)
+        app.after_request(self._finish)
+
+    # ---------- request lifecycle ----------
+
+    def _wanted(self):
+        mode = self.config.get('SQL_PROFILING', 'off')
+        return mode == 'always' or (mode == 'header' and request.headers.get(PROFILE_HEADER) == '1')
+
+    def _start(self):
+        if self._wanted():
+            g.sql_profile = {
+                'id': next(self._ids),
+                'method': request.method,
+                'path': request.full_path.rstrip('?'),
+                'started_at': time.time(),
+                'statements': [],
+            }
+
+    def _current(self):
+        if not has_request_context():
+            return None
+        profile = g.get('sql_profile')
+        if profile is None or g.get('sql_profile_explaining'):
+            return None
+        return profile
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self._current() is not None:
+            conn.info.setdefault('sql_profile_start', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        profile = self._current()
+        if profile is None or not conn.info.get('sql_profile_start'):
+            return
+        duration_ms = (time.perf_counter() - conn.info['sql_profile_start'].pop()) * 1000.0
+        profile['statements'].append({
+            'statement': statement,
+            'params': params_shape(parameters, executemany),
+            'duration_ms': round(duration_ms, 3),
+            'rows': cursor.rowcount,
+            '_parameters': None if executemany else parameters,
+        })
+
+    def _finish(self, response):
+        profile = self._current()
+        if profile is None:
+            return response
+
+        slow_ms = self.config.get('SQL_SLOW_MS', 100)
+        statements = profile['statements']
+        plans = {}
+        for stmt in statements:
+            if stmt['duration_ms'] >= slow_ms:
+                stmt['slow'] = True
+                # One EXPLAIN per distinct statement, even inside an N+1 loop
+                if stmt['statement'] not in plans:
+                    plans[stmt['statement']] = self._explain(stmt)
+                stmt['plan'] = plans[stmt['statement']]
+                logger.warning('Slow SQL (%.1f ms) in %s %s: %s\nPlan: %s', stmt['duration_ms'],
+                               profile['method'], profile['path'], stmt['statement'], stmt['plan'])
+            stmt.pop('_parameters', None)
+
+        counts = collections.Counter(s['statement'] for s in statements)
+        threshold = self.config.get('SQL_REPEAT_THRESHOLD', 5)
+        profile['repeated'] = [
+            {'statement': text, 'count': n,
+             'total_ms': round(sum(s['duration_ms'] for s in statements if s['statement'] == text), 3)}
+            for text, n in counts.most_common() if n >= threshold
+        ]
+        for rep in profile['repeated']:
+            logger.warning('Possible N+1 in %s %s: %d x %s', profile['method'], profile['path'],
+                           rep['count'], rep['statement'])
+
+        total_ms = round(sum(s['duration_ms'] for s in statements), 3)
+        profile.update(status=response.status_code, query_count=len(statements), total_ms=total_ms,
+                       slow_count=sum(1 for s in statements if s.get('slow')))
+
+        with self._lock:
+            self._recent.append(profile)
+        g.sql_profile = None
+
+        response.headers['X-SQL-Profile'] = (
+            f"id={profile['id']}; queries={len(statements)}; total_ms={total_ms}; "
+            f"slow={profile['slow_count']}; repeated={len(profile['repeated'])}"
+        )
+        response.headers.add('Server-Timing', f'db;dur={total_ms};desc="{len(statements)} queries"')
+        return response
+
+    # ---------- EXPLAIN ----------
+
+    def _explain(self, stmt):
+        """Plan for a slow statement, run on a separate connection and rolled back."""
+        text = stmt['statement']
+        if stmt['_parameters'] is None:
+            return None
+        # ANALYZE actually executes the statement, so only do it for reads
+        analyze = self.config.get('SQL_EXPLAIN_ANALYZE', True) and text.lstrip().upper().startswith('SELECT')
+        prefix = 'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ' if analyze else 'EXPLAIN (FORMAT JSON) '
+        g.sql_profile_explaining = True
+        try:
+            with self._engine.connect() as conn:
+                plan = conn.exec_driver_sql(prefix + text, stmt['_parameters']).scalar()
+                conn.rollback()
+            return plan
+        except Exception as e:
+            return {'error': str(e)}
+        finally:
+            g.sql_profile_explaining = False
+
+    # ---------- debug API ----------
+
+    def recent(self):
+        with self._lock:
+            return [{k: v for k, v in p.items() if k != 'statements'} for p in reversed(self._recent)]
+
+    def get(self, profile_id):
+        with self._lock:
+            for p in self._recent:
+                if p['id'] == profile_id:
+                    return p
+        return None
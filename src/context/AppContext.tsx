@@ -1,6 +1,7 @@
 'use client';
 
 import React, { createContext, useContext, useState, useEffect, ReactNode } from 'react';
+import { isAxiosError } from 'axios';
 import {
   Equipment,
   MaintenanceRequest,
@@ -88,6 +89,7 @@ export const AppProvider = ({ children }: { children: ReactNode }) => {
         companyId: 1,
         createdAt: item.created_at,
         updatedAt: item.created_at,
+        version: item.version,
       }));
       setMaintenanceRequests(mappedData);
     } catch (error) {
@@ -297,19 +299,29 @@ export const AppProvider = ({ children }: { children: ReactNode }) => {
   };
 
   const updateMaintenanceRequest = async (id: number, updates: Partial<MaintenanceRequest>) => {
+    const current = maintenanceRequests.find(r => r.id === id);
     try {
-      // Call backend API
-      await maintenanceAPI.updateRequest(id, {
+      // Call backend API; the version we loaded makes the server reject the edit if someone got there first
+      const result = await maintenanceAPI.updateRequest(id, {
         stage_id: updates.stageId,
         technician_user_id: updates.technicianUserId,
         priority: updates.priority,
         kanban_state: updates.kanbanState,
+        version: current?.version,
       });
       
       // Update local state
-      const updated = maintenanceRequests.map(r => r.id === id ? { ...r, ...updates } : r);
+      const updated = maintenanceRequests.map(r => r.id === id ? { ...r, ...updates, version: result.version } : r);
       setMaintenanceRequests(updated);
     } catch (error) {
+      if (isAxiosError(error) && error.response?.status === 409) {
+        // Someone else changed this request since we loaded it: show their version, not ours
+        await refreshRequests();
+        if (typeof window !== 'undefined') {
+          alert('This request was changed by someone else in the meantime. The board has been refreshed - please apply your change again.');
+        }
+        return;
+      }
       console.error('Failed to update request:', error);
       // Fallback to local state only
       const updated = maintenanceRequests.map(r => r.id === id ? { ...r, ...updates } : r);
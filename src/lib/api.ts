@@ -44,6 +44,15 @@ apiClient.interceptors.response.use(
     return response;
   },
   (error: AxiosError) => {
+    const config = error.config as (InternalAxiosRequestConfig & { _rateLimitRetried?: boolean }) | undefined;
+    if (error.response?.status === 429 && config?.method === 'get' && !config._rateLimitRetried) {
+      // Rate limited: retry a read once after the server's Retry-After, if it is short
+      const wait = Number(error.response.headers['retry-after']) || 1;
+      if (wait <= 5) {
+        config._rateLimitRetried = true;
+        return new Promise((resolve) => setTimeout(resolve, wait * 1000)).then(() => apiClient(config));
+      }
+    }
     if (error.response?.status === 401) {
       // Authentication failed - redirect to login
       if (typeof window !== 'undefined') {
@@ -96,16 +105,26 @@ export const maintenanceAPI = {
     equipment_id?: number;
     priority?: 'low' | 'medium' | 'high' | 'critical';
     scheduled_date?: string;
+    // A near-duplicate of an open request on the same equipment is created with duplicate_of set by default
+    on_duplicate?: 'merge' | 'link' | 'create';
   }) => {
     const response = await apiClient.post('/maintenance/requests', data);
     return response.data;
   },
 
+  findDuplicates: async (equipmentId: number, subject: string, description?: string) => {
+    const response = await apiClient.get('/maintenance/requests/duplicates', {
+      params: { equipment_id: equipmentId, subject, description },
+    });
+    return response.data;
+  },
+
   updateRequest: async (id: number, data: {
     stage_id?: number;
     technician_user_id?: number;
     priority?: string;
     kanban_state?: string;
+    version?: number; // rejected with 409 if the request changed since this version
   }) => {
     const response = await apiClient.put(`/maintenance/requests/${id}`, data);
     return response.data;
@@ -147,6 +166,7 @@ export const equipmentAPI = {
     technician_user_id?: number;
     location?: string;
     health_percentage?: number;
+    version?: number; // rejected with 409 if the equipment changed since this version
   }) => {
     const response = await apiClient.put(`/equipment/${id}`, data);
     return response.data;
@@ -195,6 +215,29 @@ export const stagesAPI = {
   },
 };
 
+// Background Jobs API (heavy reports/exports run off the request path)
+export const jobsAPI = {
+  submitJob: async (kind: string, params?: Record<string, unknown>, force?: boolean) => {
+    const response = await apiClient.post('/jobs', { kind, params, force });
+    return response.data;
+  },
+
+  getJob: async (id: number) => {
+    const response = await apiClient.get(`/jobs/${id}`);
+    return response.data;
+  },
+
+  cancelJob: async (id: number) => {
+    const response = await apiClient.post(`/jobs/${id}/cancel`);
+    return response.data;
+  },
+
+  downloadResult: async (id: number) => {
+    const response = await apiClient.get(`/jobs/${id}/result`, { responseType: 'blob' });
+    return response.data as Blob;
+  },
+};
+
 export default {
   auth: authAPI,
   dashboard: dashboardAPI,
@@ -202,4 +245,5 @@ export default {
   equipment: equipmentAPI,
   teams: teamsAPI,
   stages: stagesAPI,
+  jobs: jobsAPI,
 };
@@ -1,14 +1,42 @@
-import { useEffect } from 'react';
+import { useEffect, useState } from 'react';
 import { useRouter } from 'next/router';
 import Layout from '@/components/Layout';
 import { useAuth } from '@/context/AuthContext';
 import { useApp } from '@/context/AppContext';
 import { FiTrendingUp, FiDownload, FiBarChart2 } from 'react-icons/fi';
+import { jobsAPI } from '@/lib/api';
 
 export default function ReportingPage() {
   const { user, isLoading: authLoading } = useAuth();
   const { equipment, maintenanceRequests, stages } = useApp();
   const router = useRouter();
+  const [exportProgress, setExportProgress] = useState<number | null>(null);
+
+  // The report is built by a background job; poll it, then download the file
+  const handleExport = async () => {
+    setExportProgress(0);
+    try {
+      let job = await jobsAPI.submitJob('maintenance_report');
+      while (job.status === 'queued' || job.status === 'running') {
+        setExportProgress(Math.round((job.progress || 0) * 100));
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        job = await jobsAPI.getJob(job.id);
+      }
+      if (job.status === 'succeeded') {
+        const blob = await jobsAPI.downloadResult(job.id);
+        const url = URL.createObjectURL(blob);
+        const link = document.createElement('a');
+        link.href = url;
+        link.download = `maintenance-report-${job.params.start}-${job.params.end}.json`;
+        link.click();
+        URL.revokeObjectURL(url);
+      }
+    } catch (error) {
+      console.error('Report export failed:', error);
+    } finally {
+      setExportProgress(null);
+    }
+  };
 
   useEffect(() => {
     if (!authLoading && !user) {
@@ -45,9 +73,13 @@ export default function ReportingPage() {
             <p className="text-gray-600 mt-1">Monitor performance metrics</p>
           </div>
           
-          <button className="btn-primary flex items-center gap-2">
+          <button
+            className="btn-primary flex items-center gap-2"
+            onClick={handleExport}
+            disabled={exportProgress !== null}
+          >
             <FiDownload className="w-5 h-5" />
-            Export Report
+            {exportProgress !== null ? `Generating... ${exportProgress}%` : 'Export Report'}
           </button>
         </div>
 
@@ -83,6 +83,7 @@ export interface MaintenanceRequest {
   instruction?: string;
   createdAt: string;
   updatedAt: string;
+  version?: number; // row version from the API; sent back on updates so stale edits get a 409
 }
 
 export interface MaintenanceRequestActivity {
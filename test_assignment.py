@@ -0,0 +1,103 @@
+"""
+Technician auto-assignment (assignment.AssignmentEngine); no server or database needed
+"""
+from assignment import AssignmentEngine, parse_duration, request_cost
+
+print("🧰 Testing Technician Auto-Assignment\n")
+
+failures = 0
+
+def check(ok, label):
+    global failures
+    failures += 0 if ok else 1
+    print(f"{'✅' if ok else '❌'} {label}")
+
+def loads(engine, team_id):
+    return {w['technician_id']: w['load'] for w in engine.workload(team_id)}
+
+def rejects(value):
+    try:
+        parse_duration(value)
+    except ValueError:
+        return True
+    return False
+
+# Step 1: Request costs
+print("1️⃣ Costing requests...")
+check(request_cost(None, 'low') == 1.5, "No estimate: 1 hour plus the low-priority weight")
+check(request_cost(3, 'critical') == 7.0, "3 hours, critical: 3 + 4")
+check(request_cost(2, 'unknown') == request_cost(2, 'low'), "Unknown priorities weigh as low")
+check(parse_duration('') is None and parse_duration('2.5') == 2.5, "Durations parsed, blank means no estimate")
+check(all(rejects(v) for v in (-1, True, 'soon', 1e9)), "Negative, boolean, text and huge durations rejected\n")
+
+# Step 2: Least-loaded pick
+print("2️⃣ Picking the least-loaded technician...")
+engine = AssignmentEngine()
+# tech 10 holds 4h medium (5.0), tech 20 holds 1h low (1.5), tech 30 is idle
+engine.rebuild([(1, 10), (1, 20), (1, 30)], [(100, 10, 4, 'medium'), (101, 20, 1, 'low'), (102, None, 8, 'high')])
+check(loads(engine, 1) == {10: 5.0, 20: 1.5, 30: 0.0}, f"Rebuilt loads, unassigned requests ignored: {loads(engine, 1)}")
+check(engine.assign(200, 1, 2, 'low') == 30, "Idle technician picked first")
+check(engine.assign(201, 1, None, 'low') == 20, "Then the lighter of 20 (1.5) and 30 (2.5)")
+check(engine.assign(202, 1, None, 'low') == 30, "Then 30 (2.5) over 20 (3.0)")
+check(loads(engine, 1) == {10: 5.0, 20: 3.0, 30: 4.0}, f"Each pick adds its cost: {loads(engine, 1)}")
+check(engine.assign(203, 99) is None, "A team without members assigns nobody")
+engine.remove_member(1, 20)
+check(engine.assign(204, 1) == 30, "A removed member is no longer picked, even when least loaded\n")
+
+# Step 3: Release and re-track
+print("3️⃣ Releasing and re-tracking...")
+engine = AssignmentEngine()
+engine.rebuild([(1, 10), (1, 20)], [(100, 10, 4, 'medium')])
+engine.release(100)
+check(loads(engine, 1)[10] == 0.0, "Releasing a request gives its load back")
+check(engine.assign(101, 1, 2, 'low') == 10, "Ties go to the lower technician id")
+engine.track(101, 20, 2, 'low')
+check(loads(engine, 1) == {10: 0.0, 20: 2.5}, "Re-tracking moves the load, not copies it")
+engine.track(101, 20, 2, 'critical')
+check(loads(engine, 1)[20] == 6.0, "Re-tracking with a new priority replaces the old cost")
+engine.track(101, None)
+engine.release(999)
+check(loads(engine, 1) == {10: 0.0, 20: 0.0}, "Unassigning untracks; releasing an unknown request is a no-op")
+check(engine.workload(1)[0]['open_requests'] == 0, "No open requests left\n")
+
+# Step 4: Stale heap entries
+print("4️⃣ Skipping stale heap entries...")
+engine = AssignmentEngine()
+engine.rebuild([(1, 10), (1, 20), (2, 10), (2, 30)], [])
+engine.track(100, 10, 10, 'low')
+check(engine.assign(101, 1) == 20, "Tech 10's old zero-load entry is skipped after a manual assignment")
+check(engine.assign(102, 2) == 30, "Load from team 1 counts in tech 10's other team too")
+engine.release(100)
+check(engine.assign(103, 1) == 10, "After the release tech 10 is picked again")
+# Churn the loads of two technicians: every change pushes an entry, compaction keeps the heap bounded
+engine = AssignmentEngine()
+engine.rebuild([(1, 10), (1, 20)], [])
+sizes = []
+for i in range(200):
+    engine.track(i, 10 if i % 2 else 20, i % 7, 'low')
+    if i % 3:
+        engine.release(i - 1)
+    sizes.append(len(engine._heaps[1]))
+check(max(sizes) <= 4 * 2 + 16, f"Heap compacted, never above {4 * 2 + 16} entries (max {max(sizes)})")
+expected = min(loads(engine, 1).items(), key=lambda item: (item[1], item[0]))[0]
+check(engine.assign(1000, 1) == expected, "The pick after compaction is still the least loaded\n")
+
+# Step 5: Rebalancing
+print("5️⃣ Rebalancing a team...")
+engine = AssignmentEngine()
+engine.rebuild([(1, 10), (1, 20)], [(2, 10, 9, 'low')])
+# costs: 1 -> 1.5, 2 -> 4.5, 3 -> 2.5, 4 -> 3.5; request 2 was already on tech 10 with 9 hours
+result = engine.rebalance(1, [(1, 1, 'low'), (2, 4, 'low'), (3, 2, 'low'), (4, 3, 'low')])
+check(result == {2: 10, 4: 20, 3: 20, 1: 10}, f"Largest job first, each to the least loaded: {result}")
+check(loads(engine, 1) == {10: 6.0, 20: 6.0}, f"Old costs released, loads even: {loads(engine, 1)}")
+# Same jobs in arrival order (smallest first) would leave one technician at 7.5
+engine.rebuild([(1, 10), (1, 20)], [])
+for request_id, hours in [(1, 1), (2, 4), (3, 2), (4, 3)]:
+    engine.assign(request_id, 1, hours, 'low')
+check(max(loads(engine, 1).values()) == 7.5, "Assigning in arrival order is less even (7.5 vs 6.0)")
+check(engine.rebalance(99, [(5, 1, 'low')]) == {}, "A team without members places nothing\n")
+
+print("=" * 50)
+print(f"{'✅ Assignment checks completed!' if not failures else f'❌ {failures} assignment check(s) failed'}")
+print("=" * 50)
+exit(1 if failures else 0)
@@ -0,0 +1,83 @@
+import requests
+import threading
+
+BASE_URL = 'http://localhost:5000/api'
+
+print("🔒 Testing Optimistic Concurrency on Request Updates\n")
+
+# Step 1: Login
+print("1️⃣ Logging in...")
+response = requests.post(f'{BASE_URL}/login', json={
+    'email': 'admin@test.com',
+    'password': '123456'
+})
+
+if response.status_code != 200:
+    print(f"❌ Login failed: {response.json()}")
+    exit(1)
+
+token = response.json()['token']
+headers = {'Authorization': f'Bearer {token}'}
+print(f"✅ Logged in successfully\n")
+
+# Step 2: Create a request to fight over
+print("2️⃣ Creating test request...")
+response = requests.post(f'{BASE_URL}/maintenance/requests', json={
+    'subject': 'Concurrency Test Card',
+    'request_type': 'corrective',
+    'equipment_id': 1,
+    'auto_assign': False
+}, headers=headers)
+
+if response.status_code != 201:
+    print(f"❌ Failed to create request: {response.json()}")
+    exit(1)
+
+request_id = response.json()['id']
+print(f"✅ Request created! ID: {request_id}\n")
+
+# Step 3: Read it and remember its version
+print("3️⃣ Reading current version...")
+response = requests.get(f'{BASE_URL}/maintenance/requests/{request_id}', headers=headers)
+etag = response.headers.get('ETag')
+print(f"✅ Version {response.json()['version']} (ETag {etag})\n")
+
+# Step 4: Two users move the same card at once, both based on that version
+print("4️⃣ Sending two concurrent moves with If-Match...")
+results = []
+
+def move(stage_id):
+    r = requests.put(f'{BASE_URL}/maintenance/requests/{request_id}',
+                     json={'stage_id': stage_id},
+                     headers={**headers, 'If-Match': etag})
+    results.append(r)
+
+threads = [threading.Thread(target=move, args=(stage,)) for stage in (2, 3)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+
+statuses = sorted(r.status_code for r in results)
+if statuses == [200, 409]:
+    conflict = next(r for r in results if r.status_code == 409).json()
+    print(f"✅ One move won, one got 409 with current stage {conflict['current']['stage_id']}\n")
+else:
+    print(f"❌ Expected one 200 and one 409, got {statuses}\n")
+
+# Step 5: A stale version is rejected, the fresh one goes through
+print("5️⃣ Retrying with stale and fresh versions...")
+response = requests.put(f'{BASE_URL}/maintenance/requests/{request_id}',
+                        json={'priority': 'high'}, headers={**headers, 'If-Match': etag})
+print(f"{'✅' if response.status_code == 409 else '❌'} Stale If-Match: {response.status_code}")
+
+current = requests.get(f'{BASE_URL}/maintenance/requests/{request_id}', headers=headers)
+response = requests.put(f'{BASE_URL}/maintenance/requests/{request_id}',
+                        json={'priority': 'high'},
+                        headers={**headers, 'If-Match': current.headers.get('ETag')})
+print(f"{'✅' if response.status_code == 200 else '❌'} Fresh If-Match: {response.status_code}, "
+      f"now version {response.json().get('version')}\n")
+
+print("=" * 50)
+print("✅ Optimistic concurrency checks completed!")
+print("=" * 50)
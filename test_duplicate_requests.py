@@ -0,0 +1,89 @@
+import requests
+import uuid
+
+BASE_URL = 'http://localhost:5000/api'
+
+print("🔁 Testing Duplicate Request Detection\n")
+
+# Step 1: Login
+print("1️⃣ Logging in...")
+response = requests.post(f'{BASE_URL}/login', json={
+    'email': 'admin@test.com',
+    'password': '123456'
+})
+
+if response.status_code != 200:
+    print(f"❌ Login failed: {response.json()}")
+    exit(1)
+
+token = response.json()['token']
+headers = {'Authorization': f'Bearer {token}'}
+print(f"✅ Logged in successfully\n")
+
+# A marker keeps repeated runs from matching the previous run's requests
+marker = uuid.uuid4().hex
+report = {
+    'subject': f'Spindle vibration on lathe {marker}',
+    'description': f'Heavy vibration at high RPM, chatter marks on parts from batch {marker}.',
+    'request_type': 'corrective',
+    'equipment_id': 1,
+    'auto_assign': False
+}
+
+# Step 2: Original report
+print("2️⃣ Creating original request...")
+# 'create' so it is not itself linked to a previous run's report
+response = requests.post(f'{BASE_URL}/maintenance/requests', json={**report, 'on_duplicate': 'create'},
+                         headers=headers)
+if response.status_code != 201:
+    print(f"❌ Failed to create request: {response.json()}")
+    exit(1)
+original_id = response.json()['id']
+print(f"✅ Request created! ID: {original_id}\n")
+
+# Step 3: Same problem reported again, worded slightly differently
+print("3️⃣ Reporting the same problem again...")
+rewording = {
+    'subject': f'spindle vibration on the lathe {marker}',
+    'description': f'Heavy vibration at high RPM; chatter marks on parts from batch {marker}'
+}
+response = requests.post(f'{BASE_URL}/maintenance/requests', json={**report, **rewording}, headers=headers)
+data = response.json()
+if response.status_code == 201 and data.get('duplicate_of') == original_id:
+    print(f"✅ Created #{data['id']} linked to #{original_id} (similarity {data['similarity']})\n")
+else:
+    print(f"❌ Expected a linked request, got {response.status_code}: {data}\n")
+
+# Step 4: Merged instead of linked
+print("4️⃣ Reporting again with on_duplicate=merge...")
+response = requests.post(f'{BASE_URL}/maintenance/requests', json={
+    **report, **rewording, 'priority': 'high', 'on_duplicate': 'merge'
+}, headers=headers)
+data = response.json()
+if response.status_code == 200 and data.get('merged') and data['id'] == original_id:
+    print(f"✅ Merged into #{original_id} (similarity {data['similarity']})\n")
+else:
+    print(f"❌ Expected a merge into #{original_id}, got {response.status_code}: {data}\n")
+
+detail = requests.get(f'{BASE_URL}/maintenance/requests/{original_id}', headers=headers).json()
+print(f"{'✅' if detail['priority'] == 'high' else '❌'} Original priority is now {detail['priority']}\n")
+
+# Step 5: Same text on another asset is not a duplicate
+print("5️⃣ Reporting the same text on other equipment...")
+response = requests.post(f'{BASE_URL}/maintenance/requests', json={**report, 'equipment_id': 2},
+                         headers=headers)
+data = response.json()
+# It may match an earlier run's report on that equipment, never this run's original
+print(f"{'✅' if data.get('duplicate_of') != original_id else '❌'} {response.status_code}: {data}\n")
+
+# Step 6: Pre-submit check
+print("6️⃣ Checking for duplicates before submitting...")
+response = requests.get(f'{BASE_URL}/maintenance/requests/duplicates', params={
+    'equipment_id': 1, 'subject': report['subject'], 'description': report['description']
+}, headers=headers)
+ids = [m['id'] for m in response.json()]
+print(f"{'✅' if original_id in ids else '❌'} Matches: {response.json()}\n")
+
+print("=" * 50)
+print("✅ Duplicate detection checks completed!")
+print("=" * 50)
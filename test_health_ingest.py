@@ -0,0 +1,115 @@
+import requests
+import time
+import datetime
+
+BASE_URL = 'http://localhost:5000/api'
+
+print("📡 Testing Sensor Health Ingest\n")
+
+# Step 1: Login
+print("1️⃣ Logging in...")
+response = requests.post(f'{BASE_URL}/login', json={
+    'email': 'admin@test.com',
+    'password': '123456'
+})
+
+if response.status_code != 200:
+    print(f"❌ Login failed: {response.json()}")
+    exit(1)
+
+token = response.json()['token']
+headers = {'Authorization': f'Bearer {token}'}
+print(f"✅ Logged in successfully\n")
+
+# Step 2: Create a healthy test asset
+print("2️⃣ Creating test equipment at 90% health...")
+response = requests.post(f'{BASE_URL}/equipment', json={
+    'name': 'Ingest Test Pump',
+    'location': 'Test Lab',
+    'health_percentage': 90
+}, headers=headers)
+
+if response.status_code != 201:
+    print(f"❌ Failed to create equipment: {response.json()}")
+    exit(1)
+
+equipment_id = response.json()['id']
+print(f"✅ Equipment created! ID: {equipment_id}\n")
+
+# Step 3: Send a burst of readings ending below the alert threshold
+print("3️⃣ Sending 1000 readings (90% -> 20%)...")
+start = datetime.datetime.utcnow()
+readings = [{
+    'equipment_id': equipment_id,
+    'health': 90 - (70 * i / 999),
+    'ts': (start + datetime.timedelta(milliseconds=i)).isoformat()
+} for i in range(1000)]
+
+response = requests.post(f'{BASE_URL}/equipment/health/readings',
+                         json={'readings': readings},
+                         headers=headers)
+
+if response.status_code == 202:
+    print(f"✅ Accepted {response.json()['accepted']} readings\n")
+else:
+    print(f"❌ Ingest failed: {response.json()}")
+    exit(1)
+
+# Step 4: Wait for the micro-batch flush and check the stored health
+print("4️⃣ Waiting for flush...")
+time.sleep(2)
+response = requests.get(f'{BASE_URL}/equipment/{equipment_id}', headers=headers)
+health = response.json()['health']
+if health == 20:
+    print(f"✅ Health coalesced to latest reading: {health}%\n")
+else:
+    print(f"❌ Expected health 20%, got {health}%\n")
+
+# Step 5: Verify exactly one corrective request was auto-created
+print("5️⃣ Checking auto-created corrective request...")
+response = requests.get(f'{BASE_URL}/maintenance/requests', headers=headers)
+auto_requests = [r for r in response.json()
+                 if r['equipment_id'] == equipment_id and r['type'] == 'corrective']
+if len(auto_requests) == 1:
+    print(f"✅ Created: {auto_requests[0]['subject']} ({auto_requests[0]['priority']})\n")
+else:
+    print(f"❌ Expected 1 corrective request, found {len(auto_requests)}\n")
+
+# Step 6: Replay the same batch - must not create a duplicate
+print("6️⃣ Replaying the same batch...")
+requests.post(f'{BASE_URL}/equipment/health/readings', json={'readings': readings}, headers=headers)
+time.sleep(2)
+response = requests.get(f'{BASE_URL}/maintenance/requests', headers=headers)
+auto_requests = [r for r in response.json()
+                 if r['equipment_id'] == equipment_id and r['type'] == 'corrective']
+print(f"{'✅' if len(auto_requests) == 1 else '❌'} Corrective requests after replay: {len(auto_requests)}\n")
+
+# Step 7: Repair it, then let health drop again - a new incident gets a new request
+print("7️⃣ Closing the request and sending a second failure...")
+stages = requests.get(f'{BASE_URL}/stages', headers=headers).json()
+repaired = next(s['id'] for s in stages if s['name'] == 'Repaired')
+requests.put(f'{BASE_URL}/maintenance/requests/{auto_requests[0]["id"]}', json={'stage_id': repaired}, headers=headers)
+for health in (90, 15):
+    requests.post(f'{BASE_URL}/equipment/health/readings', json={'readings': [{
+        'equipment_id': equipment_id, 'health': health, 'ts': datetime.datetime.utcnow().isoformat()
+    }]}, headers=headers)
+    time.sleep(1.5)
+response = requests.get(f'{BASE_URL}/maintenance/requests', headers=headers)
+auto_requests = [r for r in response.json()
+                 if r['equipment_id'] == equipment_id and r['type'] == 'corrective']
+print(f"{'✅' if len(auto_requests) == 2 else '❌'} Corrective requests after the second failure: {len(auto_requests)}\n")
+
+# Step 8: Clean up (requests first: each must keep its equipment target)
+print("8️⃣ Deleting auto-created requests and test equipment...")
+for r in auto_requests:
+    response = requests.delete(f'{BASE_URL}/maintenance/requests/{r["id"]}', headers=headers)
+    print(f"{'✅' if response.status_code == 200 else '❌'} Request #{r['id']}: {response.json()['message']}")
+response = requests.delete(f'{BASE_URL}/equipment/{equipment_id}', headers=headers)
+if response.status_code == 200:
+    print(f"✅ Equipment deleted\n")
+else:
+    print(f"❌ Failed to delete equipment: {response.json()}")
+
+print("=" * 50)
+print("✅ Sensor ingest checks completed!")
+print("=" * 50)
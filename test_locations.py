@@ -0,0 +1,98 @@
+"""
+Equipment location paths and trees (locations.py); no server or database needed
+"""
+import locations
+
+print("🗺️ Testing Location Paths\n")
+
+failures = 0
+
+def check(ok, label):
+    global failures
+    failures += 0 if ok else 1
+    print(f"{'✅' if ok else '❌'} {label}")
+
+def rejects(value):
+    try:
+        locations.to_segments(value)
+    except ValueError as e:
+        return str(e)
+    return None
+
+# Step 1: Parsing
+print("1️⃣ Parsing locations...")
+check(locations.to_segments({'site': 'Plant A', 'building': ' Hall 2 ', 'floor': '1'}) == ['Plant A', 'Hall 2', '1'],
+      "Object form, values trimmed")
+check(locations.to_segments(' Plant A / Hall 2 /1/ ') == ['Plant A', 'Hall 2', '1'],
+      "String form, whitespace and outer separators normalized")
+check(locations.to_segments({'site': 'Plant A', 'building': '', 'floor': None}) == ['Plant A'],
+      "Empty trailing levels dropped")
+check(locations.to_segments({'site': 5}) == ['5'], "Non-string levels stringified")
+check(locations.to_segments(None) == [] and locations.to_segments('  ') == [], "None and blank mean no location\n")
+
+# Step 2: Rejections
+print("2️⃣ Rejecting bad locations...")
+for value, why in [
+    ({'site': 'Plant A', 'floor': '1'}, 'gap between levels'),
+    ({'building': 'Hall 2'}, 'no site'),
+    ({'site': 'Plant A', 'wing': 'East'}, 'unknown level'),
+    ('Plant A//Hall 2', 'empty segment'),
+    ('a/b/c/d/e', 'more than four levels'),
+    ({'site': 'Plant A/Hall 9', 'building': 'B1', 'floor': 'F1', 'room': 'R1'}, "'/' inside a level"),
+    (['Plant A'], 'not a string or object'),
+]:
+    error = rejects(value)
+    check(error is not None, f"{why}: {error}")
+print()
+
+# Step 3: Stored paths
+print("3️⃣ Stored paths...")
+path = locations.to_path(['Plant A', 'Hall 2'])
+check(path == 'Plant A/Hall 2/', f"Stored with a trailing separator: {path!r}")
+check(locations.from_path(path) == ['Plant A', 'Hall 2'], "Round-trips back to segments")
+check(locations.to_path([]) is None and locations.from_path(None) == [], "No location stores NULL")
+check(locations.display(['Plant A', 'Hall 2']) == 'Plant A / Hall 2', "Legacy display string")
+check(not locations.to_path(['Plant AB']).startswith(locations.to_path(['Plant A'])),
+      "Plant A's subtree does not include Plant AB")
+pattern = locations.subtree_pattern('Plant_1/50%/')
+check(pattern == 'Plant\\_1/50\\%/%', f"LIKE wildcards in names are escaped: {pattern!r}\n")
+
+# Step 4: Tree building
+print("4️⃣ Building a location tree...")
+# (location_path, count, health_sum, health_count, min_health, critical, open_requests)
+rows = [
+    ('Plant A/Hall 1/', 2, 150, 2, 60, 0, 1),
+    ('Plant A/Hall 1/Floor 2/', 1, 20, 1, 20, 1, 3),
+    ('Plant A/Hall 2/', 1, 90, 1, 90, 0, 0),
+    ('Plant B/', 1, None, 0, None, 0, None),
+    (None, 2, 100, 2, 40, 0, 0),
+]
+tree = locations.build_tree(rows)
+check(tree['equipment_count'] == 7 and tree['unlocated'] == 2, "Root counts every asset, 2 unlocated")
+check([c['name'] for c in tree['children']] == ['Plant A', 'Plant B'], "Sites sorted by name")
+plant_a = tree['children'][0]
+check(plant_a['level'] == 'site' and plant_a['path'] == 'Plant A', "Site node level and path")
+check((plant_a['equipment_count'], plant_a['critical_count'], plant_a['open_requests']) == (4, 1, 4),
+      "Counts roll up from every level below")
+check(plant_a['avg_health'] == 65.0 and plant_a['min_health'] == 20, "Average and minimum health roll up")
+hall_1 = plant_a['children'][0]
+check(hall_1['equipment_count'] == 3 and hall_1['children'][0]['level'] == 'floor', "Hall 1 holds its floor")
+check(tree['children'][1]['avg_health'] is None, "No readings: average health is null")
+
+shallow = locations.build_tree(rows, depth=1)
+check(all(not site['children'] for site in shallow['children']), "depth=1 folds halls into their site")
+check(shallow['children'][0]['equipment_count'] == 4, "Folded nodes keep their totals")
+
+legacy = locations.build_tree([('Plant A/Hall 9/B1/F1/R1/', 1, 50, 1, 50, 0, 0)])
+room = legacy['children'][0]['children'][0]['children'][0]['children'][0]
+check(room['level'] == 'room' and room['equipment_count'] == 1 and not room['children'],
+      "A five-level path stored before validation folds into its room")
+
+subtree = locations.build_tree(rows[:3], root=['Plant A'])
+check(subtree['name'] == 'Plant A' and [c['name'] for c in subtree['children']] == ['Hall 1', 'Hall 2'],
+      "Rooted at a site, children are its halls\n")
+
+print("=" * 50)
+print(f"{'✅ Location checks completed!' if not failures else f'❌ {failures} location check(s) failed'}")
+print("=" * 50)
+exit(1 if failures else 0)
@@ -0,0 +1,55 @@
+"""
+Migration script splitting (migrate.split_statements); no server or database needed
+"""
+from migrate import discover, split_statements
+
+print("✂️ Testing Migration Statement Splitting\n")
+
+failures = 0
+
+def check(ok, label):
+    global failures
+    failures += 0 if ok else 1
+    print(f"{'✅' if ok else '❌'} {label}")
+
+# Step 1: Plain statements
+print("1️⃣ Splitting plain statements...")
+parts = split_statements("CREATE TABLE a (id INT);\nALTER TABLE a ADD COLUMN b INT;\n\nDROP TABLE c")
+check(parts == ['CREATE TABLE a (id INT)', 'ALTER TABLE a ADD COLUMN b INT', 'DROP TABLE c'],
+      f"Split on semicolons, trimmed, last one unterminated: {len(parts)} statements")
+check(split_statements("  ;\n;\n-- only a comment;\n") == [], "Empty and comment-only chunks are dropped\n")
+
+# Step 2: Dollar-quoted bodies
+print("2️⃣ Keeping $$ bodies whole...")
+function = """CREATE OR REPLACE FUNCTION bump() RETURNS TRIGGER AS $$
+BEGIN
+  NEW.version := NEW.version + 1;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql"""
+parts = split_statements(function + ";\nCREATE TRIGGER t BEFORE UPDATE ON a FOR EACH ROW EXECUTE FUNCTION bump();")
+check(len(parts) == 2 and parts[0] == function, "Semicolons inside $$ ... $$ do not split")
+tagged = "DO $body$ BEGIN PERFORM 1; PERFORM '$$'; END $body$"
+parts = split_statements(tagged + "; SELECT 2;")
+check(parts == [tagged, 'SELECT 2'], "Tagged $body$ bodies may contain $$ and semicolons")
+check(split_statements("SELECT $1; SELECT 2") == ['SELECT $1', 'SELECT 2'], "Positional $1 is not a dollar quote")
+check(len(split_statements("DO $$ BEGIN PERFORM 1; END")) == 1, "An unterminated body runs to the end\n")
+
+# Step 3: Quotes and comments
+print("3️⃣ Respecting quotes and comments...")
+parts = split_statements("INSERT INTO t VALUES ('a;b', 'it''s; fine');\nSELECT 1")
+check(parts == ["INSERT INTO t VALUES ('a;b', 'it''s; fine')", 'SELECT 1'], "Semicolons in strings and '' escapes")
+parts = split_statements("SELECT 1 -- trailing; comment\n;SELECT 2")
+check(len(parts) == 2 and parts[0].startswith('SELECT 1'), "Semicolons in -- comments do not split\n")
+
+# Step 4: Shipped migrations
+print("4️⃣ Splitting the shipped migrations...")
+for migration in discover():
+    statements = migration.statements()
+    unbalanced = [s for s in statements if s.count('$$') % 2]
+    check(statements and not unbalanced, f"{migration.version:04d}_{migration.name}: {len(statements)} statements")
+
+print("\n" + "=" * 50)
+print(f"{'✅ Statement splitting checks completed!' if not failures else f'❌ {failures} splitting check(s) failed'}")
+print("=" * 50)
+exit(1 if failures else 0)
@@ -0,0 +1,62 @@
+import requests
+import time
+
+BASE_URL = 'http://localhost:5000/api'
+
+print("🚦 Testing Rate Limiting\n")
+
+# Step 1: Login
+print("1️⃣ Logging in...")
+response = requests.post(f'{BASE_URL}/login', json={
+    'email': 'admin@test.com',
+    'password': '123456'
+})
+
+if response.status_code != 200:
+    print(f"❌ Login failed: {response.json()}")
+    exit(1)
+
+token = response.json()['token']
+headers = {'Authorization': f'Bearer {token}'}
+print(f"✅ Logged in successfully\n")
+
+# Step 2: Poll in a tight loop until the reads bucket runs dry
+print("2️⃣ Polling /stages until limited...")
+limited = None
+for attempt in range(1, 501):
+    response = requests.get(f'{BASE_URL}/stages', headers=headers)
+    if response.status_code == 429:
+        limited = response
+        break
+
+if limited is None:
+    print("❌ Never limited after 500 requests (is RATE_LIMIT_BACKEND 'off'?)")
+    exit(1)
+
+retry_after = limited.headers.get('Retry-After')
+print(f"✅ 429 after {attempt} requests: {limited.json()['message']}")
+print(f"{'✅' if retry_after and retry_after.isdigit() else '❌'} Retry-After: {retry_after}\n")
+
+# Step 3: Writes have their own bucket
+print("3️⃣ Writing while reads are limited...")
+response = requests.put(f'{BASE_URL}/maintenance/requests/1', json={}, headers=headers)
+print(f"{'✅' if response.status_code != 429 else '❌'} PUT answered {response.status_code}\n")
+
+# Step 4: Honour Retry-After and try again
+print(f"4️⃣ Waiting {retry_after}s and retrying...")
+time.sleep(int(retry_after))
+response = requests.get(f'{BASE_URL}/stages', headers=headers)
+print(f"{'✅' if response.status_code == 200 else '❌'} After waiting: {response.status_code}\n")
+
+# Step 5: Limiter stats
+print("5️⃣ Checking limiter metrics...")
+response = requests.get(f'{BASE_URL}/metrics/rate-limits', headers=headers)
+if response.status_code == 200:
+    stats = response.json()
+    print(f"✅ Backend {stats['backend']}: {stats['allowed']} allowed, {stats['limited']} limited\n")
+else:
+    print(f"❌ Metrics failed: {response.status_code}\n")
+
+print("=" * 50)
+print("✅ Rate limiting checks completed!")
+print("=" * 50)
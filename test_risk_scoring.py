@@ -0,0 +1,69 @@
+"""
+Failure-risk scoring (risk_scoring.compute_risk_scores); no server or database needed
+"""
+from risk_scoring import compute_risk_scores
+
+print("🎯 Testing Failure-Risk Scoring\n")
+
+failures = 0
+
+def check(ok, label):
+    global failures
+    failures += 0 if ok else 1
+    print(f"{'✅' if ok else '❌'} {label}")
+
+def score(health, readings=(), corrective=(), preventive=()):
+    """One asset (id 1): readings as (age_days, health), request lists as age_days."""
+    return compute_risk_scores(
+        [1], [health],
+        [1] * len(readings), [age for age, _ in readings], [h for _, h in readings],
+        [1] * len(corrective), list(corrective),
+        [1] * len(preventive), list(preventive),
+    )[0]
+
+# Step 1: Edge cases
+print("1️⃣ Empty fleet and bounds...")
+check(len(compute_risk_scores([], [], [], [], [], [], [], [], [])) == 0, "Empty fleet scores nothing")
+check(score(100, preventive=[0]) == 0, f"Healthy, serviced today: {score(100, preventive=[0])}")
+check(score(100) == 15, f"Healthy, never serviced (only the preventive gap counts): {score(100)}")
+worst = score(0, readings=[(10, 100), (0, 0)], corrective=list(range(0, 180, 3)))
+check(95 <= worst <= 100, f"Failed, degrading, constantly repaired: {worst}\n")
+
+# Step 2: Each factor moves the score the right way
+print("2️⃣ Individual risk factors...")
+check(score(40, preventive=[0]) > score(80, preventive=[0]), "Lower health scores higher")
+check(score(60, readings=[(20, 100), (10, 80), (0, 60)], preventive=[0]) >
+      score(60, readings=[(20, 60), (10, 60), (0, 60)], preventive=[0]),
+      "Falling readings score above flat readings at the same health")
+check(score(60, readings=[(20, 20), (0, 60)], preventive=[0]) == score(60, preventive=[0]),
+      "Improving readings add no degradation risk")
+check(score(80, corrective=[5, 30, 60], preventive=[0]) > score(80, preventive=[0]),
+      "Recent corrective requests raise the score")
+check(score(80, corrective=[200, 300], preventive=[0]) == score(80, preventive=[0]),
+      "Corrective requests outside the 180-day window are ignored")
+check(score(80, preventive=[10]) < score(80, preventive=[150]) < score(80),
+      "A longer preventive gap scores higher, capped at the horizon")
+check(score(80, preventive=[150, 10]) == score(80, preventive=[10]), "Only the most recent preventive matters\n")
+
+# Step 3: Fleet ranking
+print("3️⃣ Ranking a fleet...")
+# 7: failing fast, repaired twice, never serviced; 9: degrading, serviced long ago;
+# 12: steady at 70%, serviced recently; 3: healthy, just serviced.
+# ids sorted ascending; history rows arrive in any order and may mention unknown ids
+ids = [3, 7, 9, 12]
+scores = compute_risk_scores(
+    ids, [95, 25, 70, 70],
+    [9, 12, 7, 9, 12, 7, 42], [30, 30, 30, 0, 0, 0, 0], [100, 70, 80, 70, 70, 25, 0],
+    [7, 9, 7, 99], [2, 40, 90, 1],
+    [3, 12, 9], [3, 10, 200],
+)
+ranking = [eq_id for _, eq_id in sorted(zip(scores, ids), reverse=True)]
+check(ranking == [7, 9, 12, 3], f"Riskiest first: {ranking} (scores {[float(s) for s in scores]})")
+check(all(0 <= s <= 100 for s in scores), "All scores within 0-100")
+check(score(70, readings=[(30, 70), (0, 70)], preventive=[10]) == scores[3],
+      "Asset 12 scores as if scored on its own (unknown id 42 and 99 ignored)\n")
+
+print("=" * 50)
+print(f"{'✅ Risk scoring checks completed!' if not failures else f'❌ {failures} risk scoring check(s) failed'}")
+print("=" * 50)
+exit(1 if failures else 0)